@@ -3,9 +3,6 @@
 
 import pickle
 
-with open("ba1.pkl", "rb") as f:
-    tgn = pickle.load(f)
-
 def display_edges(edges):
     string = ""
     for edge in edges:
@@ -13,10 +10,18 @@ def display_edges(edges):
     string = string[:-2]
     return string
 
+def encoding1_lines(tgn):
+    # Yields the encoding line by line; tgn can be any iterable of snapshots,
+    # including the generators from iter_tgn / iter_er_tgn / iter_complete_tgn
+    yield "The following is a description of a temporal graph network encoded as a sequence of edges.\n"
+    for i, snapshot in enumerate(tgn):
+        yield "The graph at time " + str(i) + " contains the following edges: " + display_edges(snapshot["edges"]) + ".\n"
+
 def encoding1(tgn):
-    embedding = "The following is a description of a temporal graph network encoded as a sequence of edges.\n"
-    for i in range(len(tgn)):
-        embedding += "The graph at time " + str(i) + " contains the following edges: " + display_edges(tgn[i]["edges"]) + ".\n"
-    return embedding
+    return "".join(encoding1_lines(tgn))
+
+if __name__ == "__main__":
+    with open("ba1.pkl", "rb") as f:
+        tgn = pickle.load(f)
 
-print(encoding1(tgn))
\ No newline at end of file
+    print(encoding1(tgn))
@@ -11,26 +11,27 @@ def display_edges(edges):
 def display_nodes(nodes):
     return ", ".join(str(n) for n in nodes) if nodes else "none"
 
-def encoding2(tgn):
-    embedding = "Initial Graph (t=0):\n"
-    initial_nodes = display_nodes(tgn[0]['nodes'])
-    initial_edges = display_edges(tgn[0]['edges'])
-
-    embedding += f"Nodes: {initial_nodes}\n"
-    embedding += f"Edges: {initial_edges}\n\n"
-    embedding += "Temporal Updates:\n"
+def encoding2_lines(tgn):
+    # Yields the encoding piece by piece; tgn can be any iterable of snapshots,
+    # including the generators from iter_tgn / iter_er_tgn / iter_complete_tgn
+    snapshots = iter(tgn)
+    initial = next(snapshots)
+    yield "Initial Graph (t=0):\n"
+    yield f"Nodes: {display_nodes(initial['nodes'])}\n"
+    yield f"Edges: {display_edges(initial['edges'])}\n\n"
+    yield "Temporal Updates:\n"
 
-    for t in range(1, len(tgn)):
-        step = tgn[t]
+    for t, step in enumerate(snapshots, start=1):
         if step['new_nodes']:
-            embedding += f"t={t} → Added Node(s) {display_nodes(step['new_nodes'])}\n"
+            yield f"t={t} → Added Node(s) {display_nodes(step['new_nodes'])}\n"
         if step['removed_edges'].size > 0:
             removed = display_edges(step['removed_edges'])
-            embedding += f"t={t} → Removed Edge(s) {removed}\n"
+            yield f"t={t} → Removed Edge(s) {removed}\n"
         if step['added_edges'].size > 0:
             added = display_edges(step['added_edges'])
-            embedding += f"t={t} → Added Edge(s) {added}\n"
+            yield f"t={t} → Added Edge(s) {added}\n"
         if step['removed_nodes']:
-            embedding += f"t={t} → Node(s) {display_nodes(step['removed_nodes'])} left the graph\n"
+            yield f"t={t} → Node(s) {display_nodes(step['removed_nodes'])} left the graph\n"
 
-    return embedding
+def encoding2(tgn):
+    return "".join(encoding2_lines(tgn))
@@ -1,34 +1,41 @@
 # Temporal Adjacency List (For Explicit Structural Tracking Over Time)
 # This method keeps node-centric temporal changes while tracking evolving edges in a compact way.
 
+import numpy as np
+
+from Utils.edge_intervals import EdgeIntervals
+from Utils.edge_keys import keys_to_edges
+
+def temporal_adjacency(tgn):
+    # Per undirected edge: when it first appeared and the last step it was removed at.
+    # Returns (src, tgt, added, removed) arrays with both orientations of every edge,
+    # sorted by (src, tgt); removed is -1 for edges that were never removed.
+    intervals = EdgeIntervals.from_tgn(tgn)
+    keys, first_added = intervals.first_added()
+    _, last_removed = intervals.last_removed()
+
+    lo, hi = keys_to_edges(keys).T
+    loops = lo == hi
+    src = np.concatenate([lo, hi[~loops]])
+    tgt = np.concatenate([hi, lo[~loops]])
+    added = np.concatenate([first_added, first_added[~loops]])
+    removed = np.concatenate([last_removed, last_removed[~loops]])
+    order = np.lexsort((tgt, src))
+    return src[order], tgt[order], added[order], removed[order]
+
 def encoding3(tgn):
-    adjacency_history = {}
-    for t, snapshot in enumerate(tgn):
-        edges = snapshot["edges"]
-        for edge in edges:
-            u, v = edge[:2]
-            for src, tgt in [(u, v), (v, u)]:  # undirected
-                if src not in adjacency_history:
-                    adjacency_history[src] = {}
-                if tgt not in adjacency_history[src]:
-                    adjacency_history[src][tgt] = {"added": t, "removed": None}
-    
-        removed_edges = snapshot.get("removed_edges", [])
-        for edge in removed_edges:
-            u, v = edge[:2]
-            for src, tgt in [(u, v), (v, u)]:
-                if src in adjacency_history and tgt in adjacency_history[src]:
-                    adjacency_history[src][tgt]["removed"] = t
+    src, tgt, added, removed = temporal_adjacency(tgn)
 
     output = "Temporal Adjacency List:\n"
-    for node in sorted(adjacency_history.keys()):
+    starts = np.flatnonzero(np.r_[True, src[1:] != src[:-1]]) if len(src) > 0 else []
+    ends = list(starts[1:]) + [len(src)]
+    for start, end in zip(starts, ends):
         neighbors = []
-        for neighbor in sorted(adjacency_history[node].keys()):
-            times = adjacency_history[node][neighbor]
-            timeline = f"(t={times['added']}"
-            if times["removed"] is not None:
-                timeline += f", removed t={times['removed']}"
+        for i in range(start, end):
+            timeline = f"(t={added[i]}"
+            if removed[i] >= 0:
+                timeline += f", removed t={removed[i]}"
             timeline += ")"
-            neighbors.append(f"{neighbor} {timeline}")
-        output += f"{node}: [{', '.join(neighbors)}]\n"
-    return output
\ No newline at end of file
+            neighbors.append(f"{tgt[i]} {timeline}")
+        output += f"{src[start]}: [{', '.join(neighbors)}]\n"
+    return output
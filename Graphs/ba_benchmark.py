@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+ba_benchmark.py
+
+Times the repeated-endpoint create_BA_graph against the original
+O(n^2) implementation (create_BA_graph_naive) for growing graph sizes.
+
+Usage (from the repository root):
+    python -m Graphs.ba_benchmark [--max-naive 20000] [--m 2]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from Graphs.ba_graphs import create_BA_graph, create_BA_graph_naive
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+def time_call(func, n, m, seed=0):
+    np.random.seed(seed)
+    start = time.perf_counter()
+    edges = func(n, m)
+    return time.perf_counter() - start, len(edges)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark BA graph generators")
+    parser.add_argument("--m", type=float, default=2, help="Average degree passed to both generators")
+    parser.add_argument("--max-naive", type=int, default=20_000,
+                        help="Largest n to run the O(n^2) reference on")
+    args = parser.parse_args()
+
+    print(f"{'n':>10} {'edges':>10} {'endpoint pool (s)':>18} {'naive (s)':>10} {'speedup':>8}")
+    for n in SIZES:
+        fast_time, n_edges = time_call(create_BA_graph, n, args.m)
+        if n <= args.max_naive:
+            naive_time, _ = time_call(create_BA_graph_naive, n, args.m)
+            naive_str = f"{naive_time:10.3f}"
+            speedup = f"{naive_time / fast_time:7.1f}x"
+        else:
+            naive_str, speedup = f"{'skipped':>10}", f"{'-':>8}"
+        print(f"{n:>10} {n_edges:>10} {fast_time:18.3f} {naive_str} {speedup}")
+
+
+if __name__ == "__main__":
+    main()
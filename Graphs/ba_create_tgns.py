@@ -1,45 +1,67 @@
+import itertools
 import numpy as np
 import pickle
 import random
 
-from Graphs.ba_step import step_graph, StepConfig
+from Graphs.ba_step import step_graph, StepConfig, DegreeCounter
 from Graphs.ba_graphs import create_BA_graph
+from Graphs.delta_tgn import DeltaTGN
 
-def create_tgn(ba_graph, step_config, iterations):
-    tgn = [{
+def create_tgn(ba_graph, step_config, iterations, rng=None, delta=False):
+    # delta=True stores only the initial graph and per-step changes (see DeltaTGN)
+    if delta:
+        tgn = DeltaTGN(ba_graph)
+        degrees = DegreeCounter(ba_graph)
+        for _ in range(iterations - 1):
+            edges, new_nodes, removed_nodes, removed_edges, added_edges = step_graph(ba_graph, step_config, rng=rng, degrees=degrees)
+            tgn.append(added_edges, removed_edges, new_nodes, removed_nodes)
+            ba_graph = edges
+        return tgn
+
+    return list(iter_tgn(ba_graph, step_config, iterations, rng=rng))
+
+
+def iter_tgn(ba_graph, step_config, iterations=None, rng=None):
+    # Yields the snapshots of create_tgn one at a time, so consumers only hold
+    # the current step in memory. iterations=None keeps stepping forever.
+    degrees = DegreeCounter(ba_graph)
+    yield {
         "edges": ba_graph,
         "nodes": set(ba_graph.flatten()),
         "new_nodes": set(),
         "removed_nodes": set(),
         "removed_edges": set(),
         "added_edges": set()
-    }]
+    }
 
-    for _ in range(iterations - 1):
-        edges, new_nodes, removed_nodes, removed_edges, added_edges = step_graph(ba_graph, step_config)
-        tgn.append({
+    steps = itertools.count() if iterations is None else range(iterations - 1)
+    for _ in steps:
+        edges, new_nodes, removed_nodes, removed_edges, added_edges = step_graph(ba_graph, step_config, rng=rng, degrees=degrees)
+        yield {
             "edges": edges,
-            "nodes": set(edges.flatten()),
+            "nodes": set(degrees.nodes),
             "new_nodes": new_nodes,
             "removed_nodes": removed_nodes,
             "removed_edges": removed_edges,
             "added_edges": added_edges
-        })
+        }
         ba_graph = edges
-    return tgn
 
+def main():
+    step_config = StepConfig(n_add=2, p_add=0.5, p_remove=0.5)
+    iterations = 6
 
-step_config = StepConfig(n_add=2, p_add=0.5, p_remove=0.5)
-iterations = 6
+    # 4 BA temporal graphs with different seeds
+    for i in range(1, 5):
+        np.random.seed(i)
+        random.seed(i)
+        ba_graph = create_BA_graph(5, 2)
+        tgn = create_tgn(ba_graph, step_config, iterations)
 
-# 4 BA temporal graphs with different seeds
-for i in range(1, 5):
-    np.random.seed(i)
-    random.seed(i)
-    ba_graph = create_BA_graph(5, 2)
-    tgn = create_tgn(ba_graph, step_config, iterations)
+        filename = f"ba{i}.pkl"
+        with open(filename, "wb") as f:
+            pickle.dump(tgn, f)
+        print(f"Saved {filename}")
 
-    filename = f"ba{i}.pkl"
-    with open(filename, "wb") as f:
-        pickle.dump(tgn, f)
-    print(f"Saved {filename}")
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,88 @@
 import numpy as np
 import math
 
-def create_BA_graph(n, m):
+def create_BA_graph(n, m, rng=None):
     # n: Number of nodes
     # m: Average degree
+    # rng: np.random.Generator to draw from (defaults to the global np.random state)
+    #
+    # Preferential attachment via a repeated-endpoint pool: every edge writes
+    # both of its endpoints into `endpoints`, so a uniform draw from the filled
+    # part of the pool picks node j with probability k_j / sum_k. Each new node
+    # costs O(m) instead of the O(n) renormalisation of the full degree vector.
+    rng = np.random if rng is None else rng
+    if n <= 0:
+        return np.empty((0, 2), dtype=int)
+
+    low, high = math.floor(m), math.ceil(m)
+    prob = m - low
+    seed_nodes = min(n, high)
+
+    # Number of edges each node brings (seed nodes connect to all earlier ones)
+    edge_counts = np.where(rng.random(n) < prob, high, low)
+    edge_counts[:seed_nodes] = np.arange(seed_nodes)
+    total_edges = int(edge_counts.sum())
+
+    edges = np.empty((total_edges, 2), dtype=int)
+    endpoints = np.empty(2 * total_edges, dtype=int)
+    has_degree = np.zeros(n, dtype=bool)
+    n_with_degree = 0
+    n_edges = 0
+
+    for i in range(1, n):
+        edges_to_add = int(edge_counts[i])
+        if i < m:
+            chosen_nodes = np.arange(i)
+        elif edges_to_add == 0:
+            continue
+        elif n_edges == 0:
+            # No degree mass yet (e.g. m < 1): fall back to uniform attachment
+            chosen_nodes = rng.choice(i, size=min(edges_to_add, i), replace=False)
+        elif edges_to_add >= n_with_degree:
+            chosen_nodes = np.flatnonzero(has_degree[:i])
+        else:
+            chosen_nodes = _sample_distinct(endpoints[:2 * n_edges], edges_to_add, rng)
+
+        k = len(chosen_nodes)
+        if k == 0:
+            continue
+        edges[n_edges:n_edges + k, 0] = i
+        edges[n_edges:n_edges + k, 1] = chosen_nodes
+        endpoints[2 * n_edges:2 * (n_edges + k):2] = i
+        endpoints[2 * n_edges + 1:2 * (n_edges + k):2] = chosen_nodes
+        n_edges += k
+
+        new_degree = chosen_nodes[~has_degree[chosen_nodes]]
+        has_degree[new_degree] = True
+        n_with_degree += len(new_degree)
+        if not has_degree[i]:
+            has_degree[i] = True
+            n_with_degree += 1
+
+    return edges[:n_edges]
+
+
+def _sample_distinct(pool, size, rng):
+    # Draw `size` distinct nodes from the endpoint pool, redrawing duplicates.
+    # Nodes with more endpoints in the pool are proportionally more likely.
+    chosen = []
+    seen = set()
+    while len(chosen) < size:
+        idx = (rng.random(size - len(chosen)) * len(pool)).astype(int)
+        for node in pool[idx]:
+            node = int(node)
+            if node not in seen:
+                seen.add(node)
+                chosen.append(node)
+                if len(chosen) == size:
+                    break
+    return np.array(chosen, dtype=int)
+
+
+def create_BA_graph_naive(n, m):
+    # Original O(n^2) implementation: renormalises the full degree vector and
+    # calls np.random.choice with it for every new node. Kept as a reference
+    # for Graphs/ba_benchmark.py.
     sum_k = 0
     k_count = np.zeros(n, dtype=int)
     k_dist = np.zeros(n, dtype=float)
@@ -16,7 +95,6 @@ def create_BA_graph(n, m):
             k_count[i] = i
             for j in range(i):
                 edges.append([i, j])
-                # edges.append([j, i])
                 k_count[j] += 1
         else:
             # Compute k_dist
@@ -29,8 +107,7 @@ def create_BA_graph(n, m):
             # Add edges
             for node in chosen_nodes:
                 edges.append([i, node])
-                # edges.append([node, i])
                 k_count[node] += 1
             k_count[i] = edges_to_add
             sum_k += 2*edges_to_add
-    return np.array(edges)
\ No newline at end of file
+    return np.array(edges)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+batch_tgns.py
+
+Generates large batches of temporal graphs across a process pool.
+
+Every graph gets its own np.random.Generator spawned from a single
+SeedSequence, so graph i is the same no matter how many workers run or in
+which order shards finish. Graphs are written to disk in shards of
+`shard_size` as soon as the worker producing them is done.
+
+Usage (from the repository root):
+    python -m Graphs.batch_tgns --graph_type ba --n_graphs 1000 --out_dir Data/graphs/ba
+"""
+
+import argparse
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from Graphs.step import StepConfig
+from Graphs.ba_graphs import create_BA_graph
+from Graphs.er_graphs import create_er_edges
+from Graphs.complete_graphs import create_complete_edges
+from Graphs.ba_create_tgns import create_tgn
+from Graphs.er_create_tgns import create_er_tgn
+from Graphs.compl_create_tgns import create_complete_tgn
+from Graphs.contact_models import (
+    power_law_activity,
+    iter_activity_driven,
+    iter_temporal_sbm,
+    iter_bursty_contacts
+)
+from Graphs.graph_config import GRAPH_PARAMS
+
+
+def generate_tgn(graph_type, graph_params, step_config, iterations, rng):
+    """Create a single TGN of the given type, drawing all randomness from rng."""
+    if graph_type == "ba":
+        ba_graph = create_BA_graph(rng=rng, **graph_params)
+        return create_tgn(ba_graph, step_config, iterations, rng=rng)
+    if graph_type == "er":
+        er_edges = create_er_edges(rng=rng, **graph_params)
+        return create_er_tgn(er_edges, step_config, iterations, rng=rng)
+    if graph_type == "complete":
+        complete_edges = create_complete_edges(**graph_params)
+        return create_complete_tgn(complete_edges, step_config, iterations, rng=rng)
+    if graph_type == "activity":
+        activity = power_law_activity(graph_params["num_nodes"], graph_params["gamma"], graph_params["eps"], rng=rng)
+        return list(iter_activity_driven(graph_params["num_nodes"], activity, graph_params["m"], iterations, rng=rng))
+    if graph_type == "sbm":
+        roles = np.arange(graph_params["num_nodes"]) % graph_params["n_blocks"]
+        p_matrix = np.full((graph_params["n_blocks"], graph_params["n_blocks"]), graph_params["p_out"])
+        np.fill_diagonal(p_matrix, graph_params["p_in"])
+        return list(iter_temporal_sbm(roles, p_matrix, graph_params["p_keep"], iterations, rng=rng))
+    if graph_type == "bursty":
+        backbone = create_er_edges(graph_params["num_nodes"], graph_params["edge_prob"], rng=rng)
+        return list(iter_bursty_contacts(backbone, graph_params["base_rate"], graph_params["excitation"],
+                                         graph_params["decay"], iterations, rng=rng))
+    raise ValueError(f"Unknown graph type: {graph_type}")
+
+
+def shard_path(out_dir, graph_type, shard):
+    return os.path.join(out_dir, f"{graph_type}_shard{shard:05d}.pkl")
+
+
+def _generate_shard(graph_type, graph_params, step_config, iterations, seeds, shard, out_dir):
+    # Worker entry point: build one shard of graphs and write it atomically
+    tgns = [
+        generate_tgn(graph_type, graph_params, step_config, iterations, np.random.default_rng(seed))
+        for seed in seeds
+    ]
+    path = shard_path(out_dir, graph_type, shard)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(tgns, f)
+    os.replace(tmp_path, path)
+    return path
+
+
+def generate_batch(graph_type, n_graphs, step_config, iterations, out_dir,
+                   graph_params=None, seed=0, shard_size=100, workers=None):
+    """
+    Generate n_graphs TGNs in parallel and write them to out_dir in shards.
+
+    Graph i always uses the i-th child of SeedSequence(seed) and always lands
+    at position i % shard_size of shard i // shard_size, so the output is
+    bit-identical for any number of workers. Returns the shard paths in order.
+    """
+    if graph_params is None:
+        graph_params = GRAPH_PARAMS[graph_type]
+    os.makedirs(out_dir, exist_ok=True)
+
+    seeds = np.random.SeedSequence(seed).spawn(n_graphs)
+    n_shards = (n_graphs + shard_size - 1) // shard_size
+    paths = [shard_path(out_dir, graph_type, shard) for shard in range(n_shards)]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(
+                _generate_shard, graph_type, graph_params, step_config, iterations,
+                seeds[shard * shard_size:(shard + 1) * shard_size], shard, out_dir,
+            ): shard
+            for shard in range(n_shards)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            print(f"[{done}/{n_shards}] Saved {future.result()}")
+
+    return paths
+
+
+def load_batch(paths):
+    """Yield the TGNs stored in the given shard files, in order."""
+    for path in paths:
+        with open(path, "rb") as f:
+            yield from pickle.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a batch of TGNs in parallel")
+    parser.add_argument("--graph_type", choices=sorted(GRAPH_PARAMS), required=True)
+    parser.add_argument("--n_graphs", type=int, required=True)
+    parser.add_argument("--iterations", type=int, default=6)
+    parser.add_argument("--n_add", type=int, default=2)
+    parser.add_argument("--p_add", type=float, default=0.5)
+    parser.add_argument("--p_remove", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--shard_size", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out_dir", default="Data/graphs")
+    args = parser.parse_args()
+
+    step_config = StepConfig(n_add=args.n_add, p_add=args.p_add, p_remove=args.p_remove)
+    generate_batch(args.graph_type, args.n_graphs, step_config, args.iterations, args.out_dir,
+                   seed=args.seed, shard_size=args.shard_size, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,48 +1,67 @@
+import itertools
 import numpy as np
 import pickle
 
-from Graphs.compl_step import step_graph, StepConfig
+from Graphs.compl_step import step_graph, StepConfig, DegreeCounter
 from Graphs.complete_graphs import create_complete_graph
+from Graphs.delta_tgn import DeltaTGN
+from Graphs.step import graph_to_array, initial_nodes
 
-def complete_graph_to_array(graph, timestamp=0):
-    return np.array([[u, v, timestamp] for u, v in graph.edges()])
+def create_complete_tgn(initial_graph, step_config, iterations, rng=None, delta=False):
+    # delta=True stores only the initial graph and per-step changes (see DeltaTGN)
+    if delta:
+        edges = graph_to_array(initial_graph, timestamp=0)
+        tgn = DeltaTGN(edges, initial_nodes=initial_nodes(initial_graph, edges))
+        degrees = DegreeCounter(edges)
+        for t in range(1, iterations):
+            edges, new_nodes, removed_nodes, removed_edges, added_edges = step_graph(edges, step_config, current_time=t, rng=rng, degrees=degrees)
+            tgn.append(added_edges, removed_edges, new_nodes, removed_nodes)
+        return tgn
 
-def create_complete_tgn(initial_graph, step_config, iterations):
-    edges = complete_graph_to_array(initial_graph, timestamp=0)
+    return list(iter_complete_tgn(initial_graph, step_config, iterations, rng=rng))
 
-    tgn = [{
+def iter_complete_tgn(initial_graph, step_config, iterations=None, rng=None):
+    # Yields the snapshots of create_complete_tgn one at a time, so consumers only hold
+    # the current step in memory. iterations=None keeps stepping forever.
+    edges = graph_to_array(initial_graph, timestamp=0)
+
+    degrees = DegreeCounter(edges)
+    yield {
         "edges": edges,
-        "nodes": set(initial_graph.nodes()),
+        "nodes": initial_nodes(initial_graph, edges),
         "new_nodes": set(),
         "removed_nodes": set(),
         "removed_edges": set(),
         "added_edges": set()
-    }]
+    }
 
-    for t in range(1, iterations):
-        edges, new_nodes, removed_nodes, removed_edges, added_edges = step_graph(edges, step_config, current_time=t)
-        tgn.append({
+    times = itertools.count(1) if iterations is None else range(1, iterations)
+    for t in times:
+        edges, new_nodes, removed_nodes, removed_edges, added_edges = step_graph(edges, step_config, current_time=t, rng=rng, degrees=degrees)
+        yield {
             "edges": edges,
-            "nodes": set(edges[:, :2].flatten()),
+            "nodes": set(degrees.nodes),
             "new_nodes": new_nodes,
             "removed_nodes": removed_nodes,
             "removed_edges": removed_edges,
             "added_edges": added_edges
-        })
+        }
 
-    return tgn
+def main():
+    step_config = StepConfig(n_add=2, p_add=0.5, p_remove=0.5)
+    iterations = 6
 
-step_config = StepConfig(n_add=2, p_add=0.5, p_remove=0.5)
-iterations = 6
+    # 4 different complete TGNs
+    for i in range(1, 5):
+        print(f"Generating complete graph {i}...")
+        complete_graph = create_complete_graph(num_nodes=5 + i)  # vary node count slightly
+        tgn = create_complete_tgn(complete_graph, step_config, iterations)
 
-# 4 different complete TGNs
-for i in range(1, 5):
-    print(f"Generating complete graph {i}...")
-    complete_graph = create_complete_graph(num_nodes=5 + i)  # vary node count slightly
-    tgn = create_complete_tgn(complete_graph, step_config, iterations)
+        filename = f"complete{i}.pkl"
+        with open(filename, "wb") as f:
+            pickle.dump(tgn, f)
+        print(f"Saved to {filename}")
 
-    filename = f"complete{i}.pkl"
-    with open(filename, "wb") as f:
-        pickle.dump(tgn, f)
-    print(f"Saved to {filename}")
+if __name__ == "__main__":
+    main()
 
@@ -1,4 +1,5 @@
 import networkx as nx
+import numpy as np
 
 def create_complete_graph(num_nodes=10):
     """
@@ -7,3 +8,11 @@ def create_complete_graph(num_nodes=10):
     g = nx.complete_graph(num_nodes)
     g.graph['name'] = f"Complete_Graph_{num_nodes}"
     return g
+
+def create_complete_edges(num_nodes=10, timestamp=0):
+    """
+    Create a complete graph directly as an [u, v, timestamp] edge array, without
+    building a networkx graph. Rows come out with u < v, in networkx edge order.
+    """
+    u, v = np.triu_indices(num_nodes, k=1)
+    return np.column_stack([u, v, np.full(len(u), timestamp)])
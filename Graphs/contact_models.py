@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+contact_models.py
+
+Temporal contact generators that look more like face-to-face data such as
+the hospital ward: each step is a bin of contacts, so edges appear and
+disappear rather than accumulating around a seed graph.
+
+- iter_activity_driven: activity-driven networks (Perra et al. 2012)
+- iter_temporal_sbm:    temporal stochastic block model with node roles
+- iter_bursty_contacts: Hawkes-like self-exciting contacts on a backbone
+
+Every generator draws a whole step with array operations and yields the
+same snapshot dicts as iter_tgn, with undirected [u, v] rows (u < v),
+sorted, like hospital.pkl. iterations=None keeps stepping forever.
+"""
+
+import itertools
+
+import numpy as np
+
+from Graphs.er_graphs import sample_pair_positions, pair_index_to_edge
+from Utils.edge_keys import unique_keys, keys_to_edges, edge_difference
+
+
+def power_law_activity(num_nodes, gamma=2.1, eps=0.01, rng=None):
+    '''
+    Activity rates a_i drawn from F(a) ~ a^-gamma on [eps, 1],
+    the heavy-tailed distribution used for activity-driven networks.
+    '''
+    rng = np.random if rng is None else rng
+    u = rng.random(num_nodes)
+    exponent = 1 - gamma
+    return (eps ** exponent + u * (1 - eps ** exponent)) ** (1 / exponent)
+
+
+def iter_activity_driven(num_nodes, activity, m=1, iterations=None, rng=None):
+    '''
+    Activity-driven network: at every step node i is active with probability
+    activity[i] and then contacts m other nodes chosen uniformly at random.
+    activity = scalar or array of per-node activation probabilities
+    '''
+    if num_nodes < 2:
+        raise ValueError(f"Activity-driven contacts need at least 2 nodes, got {num_nodes}")
+    rng = np.random if rng is None else rng
+    activity = np.broadcast_to(np.asarray(activity, dtype=float), (num_nodes,))
+
+    def draw_step():
+        active = np.flatnonzero(rng.random(num_nodes) < activity)
+        sources = np.repeat(active, m)
+        # Uniform over the other num_nodes - 1 nodes, skipping the source itself
+        targets = (rng.random(len(sources)) * (num_nodes - 1)).astype(np.int64)
+        targets += targets >= sources
+        return canonical_edges(sources, targets)
+
+    return _iter_snapshots(draw_step, iterations)
+
+
+def iter_temporal_sbm(roles, p_matrix, p_keep=0.0, iterations=None, rng=None):
+    '''
+    Temporal stochastic block model: at every step a pair of nodes with roles
+    (a, b) is in contact with probability p_matrix[a][b]. With p_keep > 0 each
+    contact also carries over to the next step with that probability, which
+    gives contacts some duration.
+    roles = role (block) index per node, 0..B-1
+    p_matrix = B x B symmetric matrix of contact probabilities
+    '''
+    rng = np.random if rng is None else rng
+    roles = np.asarray(roles)
+    p_matrix = np.asarray(p_matrix, dtype=float)
+    # Sort nodes by role so every block is a contiguous id range
+    order = np.argsort(roles, kind="stable")
+    bounds = np.searchsorted(roles[order], np.arange(len(p_matrix) + 1))
+    previous = np.empty((0, 2), dtype=np.int64)
+
+    def draw_step():
+        nonlocal previous
+        parts = [previous[rng.random(len(previous)) < p_keep]] if p_keep > 0 else []
+        for a in range(len(p_matrix)):
+            members_a = order[bounds[a]:bounds[a + 1]]
+            # Pairs inside block a
+            n_a = len(members_a)
+            u, v = pair_index_to_edge(sample_pair_positions(n_a * (n_a - 1) // 2, p_matrix[a, a], rng), n_a)
+            parts.append(np.column_stack([members_a[u], members_a[v]]))
+            # Pairs between block a and each later block b
+            for b in range(a + 1, len(p_matrix)):
+                members_b = order[bounds[b]:bounds[b + 1]]
+                positions = sample_pair_positions(n_a * len(members_b), p_matrix[a, b], rng)
+                parts.append(np.column_stack([members_a[positions // len(members_b)],
+                                              members_b[positions % len(members_b)]]))
+        edges = np.vstack(parts)
+        previous = canonical_edges(edges[:, 0], edges[:, 1])
+        return previous
+
+    return _iter_snapshots(draw_step, iterations)
+
+
+def iter_bursty_contacts(backbone, base_rate, excitation=0.5, decay=0.5, iterations=None, rng=None):
+    '''
+    Hawkes-like bursty contacts on a fixed backbone of candidate pairs. Each
+    pair has intensity base_rate + excitation * h, where h is an exponentially
+    decaying count of its past contacts (h <- decay * h + contacts). The number
+    of contacts in a step is Poisson with that intensity and the edge is present
+    when it is at least one, so contacts cluster in bursts.
+    backbone = (E, 2+) array of candidate pairs, e.g. from create_er_edges
+    base_rate = scalar or per-pair background intensity
+    '''
+    rng = np.random if rng is None else rng
+    backbone = canonical_edges(np.asarray(backbone)[:, 0], np.asarray(backbone)[:, 1])
+    base_rate = np.broadcast_to(np.asarray(base_rate, dtype=float), (len(backbone),))
+    history = np.zeros(len(backbone))
+
+    def draw_step():
+        nonlocal history
+        contacts = rng.poisson(base_rate + excitation * history)
+        history = decay * history + contacts
+        return backbone[contacts > 0]
+
+    return _iter_snapshots(draw_step, iterations)
+
+
+def canonical_edges(u, v):
+    # Undirected, deduplicated, self-loop free [u, v] rows with u < v, sorted
+    u, v = np.asarray(u, dtype=np.int64), np.asarray(v, dtype=np.int64)
+    keep = u != v
+    return keys_to_edges(unique_keys(np.column_stack([u[keep], v[keep]])))
+
+
+def _iter_snapshots(draw_step, iterations):
+    # Turns a per-step edge sampler into the usual stream of snapshot dicts
+    edges = draw_step()
+    nodes = set(edges.flatten().tolist())
+    yield {
+        "edges": edges,
+        "nodes": nodes,
+        "new_nodes": set(),
+        "removed_nodes": set(),
+        "removed_edges": set(),
+        "added_edges": set()
+    }
+
+    steps = itertools.count() if iterations is None else range(iterations - 1)
+    for _ in steps:
+        previous_edges, previous_nodes = edges, nodes
+        edges = draw_step()
+        nodes = set(edges.flatten().tolist())
+        yield {
+            "edges": edges,
+            "nodes": nodes,
+            "new_nodes": nodes - previous_nodes,
+            "removed_nodes": previous_nodes - nodes,
+            "removed_edges": edge_difference(previous_edges, edges),
+            "added_edges": edge_difference(edges, previous_edges)
+        }
+
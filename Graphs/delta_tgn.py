@@ -0,0 +1,94 @@
+import numpy as np
+
+from Utils.edge_keys import edge_isin
+
+class DeltaTGN:
+    """
+    Temporal graph stored as the initial edge array plus per-step deltas.
+
+    Only the added/removed edge arrays (and new/removed node sets) of each
+    step are kept, so memory grows with the number of changes instead of
+    O(T * E). Indexing materializes the same snapshot dicts the create_*tgn
+    functions return, replaying deltas from the closest cached state.
+    """
+
+    def __init__(self, initial_edges, initial_nodes=None):
+        self.initial_edges = np.asarray(initial_edges)
+        if initial_nodes is None:
+            initial_nodes = set(self.initial_edges[:, :2].flatten()) if len(self.initial_edges) > 0 else set()
+        self.initial_nodes = initial_nodes
+        self.added_edges = []
+        self.removed_edges = []
+        self.new_nodes = []
+        self.removed_nodes = []
+        # Last materialized (t, edges) so sequential access replays one step at a time
+        self._cached = (0, self.initial_edges)
+
+    def append(self, added_edges, removed_edges, new_nodes, removed_nodes):
+        self.added_edges.append(added_edges)
+        self.removed_edges.append(removed_edges)
+        self.new_nodes.append(new_nodes)
+        self.removed_nodes.append(removed_nodes)
+
+    def __len__(self):
+        return len(self.added_edges) + 1
+
+    def __iter__(self):
+        edges = self.initial_edges
+        yield self._snapshot(0, edges)
+        for t in range(1, len(self)):
+            edges = self._apply(edges, t)
+            yield self._snapshot(t, edges)
+
+    def __getitem__(self, t):
+        if isinstance(t, slice):
+            return [self[i] for i in range(*t.indices(len(self)))]
+        if t < 0:
+            t += len(self)
+        if not 0 <= t < len(self):
+            raise IndexError("DeltaTGN index out of range")
+        return self._snapshot(t, self.edges_at(t))
+
+    def edges_at(self, t):
+        """Edge array at step t, replayed from the cached state when possible."""
+        start, edges = self._cached
+        if t < start:
+            start, edges = 0, self.initial_edges
+        for step in range(start + 1, t + 1):
+            edges = self._apply(edges, step)
+        self._cached = (t, edges)
+        return edges
+
+    def to_list(self):
+        """Materialize every snapshot, as create_*tgn would without delta storage."""
+        return list(self)
+
+    def _apply(self, edges, t):
+        # Drop the rows removed at step t (matched on their endpoints) and
+        # append the rows added at step t, preserving step_graph's row order
+        removed = self.removed_edges[t - 1]
+        added = self.added_edges[t - 1]
+        if len(removed) > 0 and len(edges) > 0:
+            edges = edges[~edge_isin(edges, removed)]
+        if len(added) > 0:
+            edges = np.vstack([edges, added]) if len(edges) > 0 else added
+        return edges
+
+    def _snapshot(self, t, edges):
+        if t == 0:
+            return {
+                "edges": edges,
+                "nodes": self.initial_nodes,
+                "new_nodes": set(),
+                "removed_nodes": set(),
+                "removed_edges": set(),
+                "added_edges": set()
+            }
+        return {
+            "edges": edges,
+            "nodes": set(edges[:, :2].flatten()) if len(edges) > 0 else set(),
+            "new_nodes": self.new_nodes[t - 1],
+            "removed_nodes": self.removed_nodes[t - 1],
+            "removed_edges": self.removed_edges[t - 1],
+            "added_edges": self.added_edges[t - 1]
+        }
@@ -1,4 +1,5 @@
 import networkx as nx
+import numpy as np
 import random
 
 def create_er_graph(num_nodes=10, edge_prob=0.3, seed=None):
@@ -10,3 +11,63 @@ def create_er_graph(num_nodes=10, edge_prob=0.3, seed=None):
     g = nx.erdos_renyi_graph(n=num_nodes, p=edge_prob, seed=seed)
     g.graph['name'] = "ER_Graph"
     return g
+
+def create_er_edges(num_nodes=10, edge_prob=0.3, timestamp=0, rng=None):
+    '''
+    Creates a G(n, p) Erdos-Renyi graph directly as an [u, v, timestamp] edge array,
+    without building a networkx graph.
+    num_nodes = number of nodes
+    edge_prob = probability for edge creation
+    rng = np.random.Generator to draw from (defaults to the global np.random state)
+
+    The n(n-1)/2 candidate pairs are numbered in row-major upper-triangle order
+    and the selected ones are found by skipping geometric gaps between them, so
+    the cost is O(n + E) instead of O(n^2). Rows come out with u < v, in the
+    same order networkx lists the edges.
+    '''
+    rng = np.random if rng is None else rng
+    n_pairs = num_nodes * (num_nodes - 1) // 2
+    positions = sample_pair_positions(n_pairs, edge_prob, rng)
+    u, v = pair_index_to_edge(positions, num_nodes)
+    return np.column_stack([u, v, np.full(len(positions), timestamp, dtype=np.int64)])
+
+def sample_pair_positions(n_pairs, edge_prob, rng=None):
+    '''
+    Picks each of the indices 0..n_pairs-1 independently with probability edge_prob,
+    by skipping geometric gaps between picked indices. Returns them sorted.
+    '''
+    rng = np.random if rng is None else rng
+    if n_pairs == 0 or edge_prob <= 0:
+        return np.empty(0, dtype=np.int64)
+    if edge_prob >= 1:
+        return np.arange(n_pairs, dtype=np.int64)
+
+    # Draw skips in batches sized a few standard deviations above the mean
+    mean = n_pairs * edge_prob
+    batch = int(mean + 4 * np.sqrt(mean * (1 - edge_prob))) + 16
+    chunks = []
+    last = -1
+    while last < n_pairs:
+        gaps = rng.geometric(edge_prob, size=batch).astype(np.int64)
+        chunk = last + np.cumsum(gaps)
+        chunks.append(chunk)
+        last = chunk[-1]
+    positions = np.concatenate(chunks)
+    return positions[positions < n_pairs]
+
+def pair_index_to_edge(positions, num_nodes):
+    '''
+    Maps indices into the row-major upper triangle of an n x n matrix
+    (pairs (0, 1), (0, 2), ..., (1, 2), ...) back to (u, v) with u < v.
+    '''
+    positions = np.asarray(positions, dtype=np.int64)
+    n = num_nodes
+    # Row u starts at offset u * (2n - u - 1) / 2; invert with the quadratic formula
+    b = 2 * n - 1
+    u = np.floor((b - np.sqrt(np.maximum(b * b - 8.0 * positions, 0))) / 2).astype(np.int64)
+    # Fix floating point off-by-ones at row boundaries
+    row_start = lambda r: r * (2 * n - r - 1) // 2
+    u -= positions < row_start(u)
+    u += positions >= row_start(u + 1)
+    v = positions - row_start(u) + u + 1
+    return u, v
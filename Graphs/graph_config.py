@@ -0,0 +1,68 @@
+from Graphs.step import StepConfig
+
+# Parameters of the initial graph for each generator, with their defaults
+GRAPH_PARAMS = {
+    "ba": {"n": 5, "m": 2},
+    "er": {"num_nodes": 6, "edge_prob": 0.4},
+    "complete": {"num_nodes": 6},
+    # Contact models (Graphs/contact_models.py) only use `iterations` of the step parameters
+    "activity": {"num_nodes": 50, "m": 1, "gamma": 2.1, "eps": 0.01},
+    "sbm": {"num_nodes": 50, "n_blocks": 2, "p_in": 0.1, "p_out": 0.01, "p_keep": 0.5},
+    "bursty": {"num_nodes": 50, "edge_prob": 0.1, "base_rate": 0.05, "excitation": 0.5, "decay": 0.5},
+}
+
+# Parameters of the temporal dynamics, shared by every generator
+STEP_PARAMS = {"n_add": 2, "p_add": 0.5, "p_remove": 0.5, "iterations": 6}
+
+
+class GraphConfig:
+    def __init__(self, graph_type, graph_params, step_config, iterations):
+        self.graph_type = graph_type
+        self.graph_params = graph_params
+        self.step_config = step_config
+        self.iterations = iterations
+
+    def to_dict(self):
+        return {
+            "graph_type": self.graph_type,
+            "graph_params": self.graph_params,
+            "n_add": self.step_config.n_add,
+            "p_add": self.step_config.p_add,
+            "p_remove": self.step_config.p_remove,
+            "iterations": self.iterations,
+        }
+
+
+def parse_value(value):
+    # "5" -> 5, "0.5" -> 0.5
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def parse_graph_config(graph_type, config=""):
+    '''
+    Parses a --graph_config string such as "n=20,m=2,p_add=0.3,iterations=10".
+    Keys not given fall back to the defaults in GRAPH_PARAMS / STEP_PARAMS.
+    '''
+    if graph_type not in GRAPH_PARAMS:
+        raise ValueError(f"Unknown graph type: {graph_type} (expected one of {', '.join(sorted(GRAPH_PARAMS))})")
+
+    graph_params = dict(GRAPH_PARAMS[graph_type])
+    step_params = dict(STEP_PARAMS)
+    for item in filter(None, (part.strip() for part in config.split(","))):
+        key, sep, value = item.partition("=")
+        key = key.strip()
+        if not sep:
+            raise ValueError(f"Expected key=value in graph config, got: {item}")
+        if key in graph_params:
+            graph_params[key] = parse_value(value.strip())
+        elif key in step_params:
+            step_params[key] = parse_value(value.strip())
+        else:
+            valid = sorted(graph_params) + sorted(step_params)
+            raise ValueError(f"Unknown parameter {key} for {graph_type} (expected one of {', '.join(valid)})")
+
+    step_config = StepConfig(n_add=int(step_params["n_add"]), p_add=step_params["p_add"], p_remove=step_params["p_remove"])
+    return GraphConfig(graph_type, graph_params, step_config, int(step_params["iterations"]))
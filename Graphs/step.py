@@ -0,0 +1,130 @@
+import numpy as np
+
+def graph_to_array(graph, timestamp=0):
+    # [u, v, t] rows of an initial networkx graph (ER / complete); edge arrays
+    # from the array-native generators are used as they are
+    if isinstance(graph, np.ndarray):
+        return graph
+    edges = np.array(list(graph.edges()), dtype=int).reshape(-1, 2)
+    return np.column_stack([edges, np.full(len(edges), timestamp)])
+
+def initial_nodes(graph, edges):
+    # networkx graphs keep their isolated nodes; edge arrays only know their endpoints
+    if isinstance(graph, np.ndarray):
+        return set(edges[:, :2].flatten())
+    return set(graph.nodes())
+
+class StepConfig:
+    def __init__(self, n_add, p_add, p_remove):
+        self.n_add = n_add
+        self.p_add = p_add
+        self.p_remove = p_remove
+
+class DegreeCounter:
+    """
+    Node degrees carried from one step to the next.
+
+    Updating it with a step's removed and added edges touches only those
+    edges, so the node set and the nodes that appear or drop out come out in
+    O(changes) instead of rebuilding set(edges.flatten()) every step.
+    """
+
+    def __init__(self, edges):
+        endpoints = np.asarray(edges)[:, :2].ravel() if len(edges) > 0 else np.empty(0, dtype=int)
+        self.degree = np.bincount(endpoints, minlength=16)
+        self.nodes = set(np.flatnonzero(self.degree).tolist())
+        self.max_node = max(self.nodes) if self.nodes else -1
+
+    def remove(self, edges):
+        # Returns the nodes whose degree dropped to zero
+        nodes, counts = self._endpoint_counts(edges)
+        self.degree[nodes] -= counts
+        dropped = nodes[self.degree[nodes] == 0].tolist()
+        self.nodes.difference_update(dropped)
+        # The highest node id only moves down past nodes that lost all edges,
+        # and only moves up by the ids new nodes take, so this is amortized O(changes)
+        while self.max_node >= 0 and self.degree[self.max_node] == 0:
+            self.max_node -= 1
+        return set(dropped)
+
+    def add(self, edges):
+        # Returns the nodes whose degree rose from zero
+        nodes, counts = self._endpoint_counts(edges)
+        if len(nodes) > 0 and nodes[-1] >= len(self.degree):
+            self.degree = np.concatenate([self.degree, np.zeros(max(len(self.degree), nodes[-1] + 1), dtype=self.degree.dtype)])
+        appeared = nodes[self.degree[nodes] == 0].tolist()
+        self.degree[nodes] += counts
+        self.nodes.update(appeared)
+        if len(nodes) > 0:
+            self.max_node = max(self.max_node, int(nodes[-1]))
+        return set(appeared)
+
+    @staticmethod
+    def _endpoint_counts(edges):
+        if len(edges) == 0:
+            return np.empty(0, dtype=int), np.empty(0, dtype=int)
+        return np.unique(np.asarray(edges)[:, :2].ravel(), return_counts=True)
+
+def step_graph(edges, step_config, current_time=None, rng=None, degrees=None):
+    # edges: array of edges, either [u, v] rows (BA) or [u, v, t] rows (ER / complete)
+    # step_config: StepConfig with n_add, p_add and p_remove
+    # current_time: timestamp written into the third column of added edges.
+    #               None keeps the 2-column layout.
+    # rng: np.random.Generator to draw from (defaults to the global np.random state)
+    # degrees: optional DegreeCounter for `edges`, updated in place. When given, node
+    #          bookkeeping is done from the changed edges only.
+    # returns: updated edges, new nodes, removed_nodes, removed edges, added edges
+    rng = np.random if rng is None else rng
+    timestamped = current_time is not None
+    width = 3 if timestamped else 2
+
+    edges = np.array(edges)
+    if len(edges) == 0:
+        edges = edges.reshape(0, width).astype(int)
+
+    # Find all nodes in the original graph
+    if degrees is None:
+        original_nodes = set(edges[:, :2].flatten()) if len(edges) > 0 else set()
+        original_max = max(original_nodes) if original_nodes else -1
+    else:
+        original_max = degrees.max_node
+
+    # Remove edges based on p_remove
+    keep_mask = rng.random(len(edges)) >= step_config.p_remove
+    removed_edges = edges[~keep_mask]
+    edges = edges[keep_mask]
+    if degrees is not None:
+        dropped_nodes = degrees.remove(removed_edges)
+
+    # Next free node id after edge removal
+    if len(edges) > 0:
+        current_nodes = degrees.max_node + 1 if degrees is not None else int(np.max(edges[:, :2])) + 1
+    else:
+        current_nodes = original_max + 1
+
+    # Add new nodes
+    new_nodes = range(current_nodes, current_nodes + step_config.n_add)
+
+    # Connect new nodes to existing nodes based on p_add. One Bernoulli draw per
+    # (new_node, existing_node) pair, drawn as a single matrix in row-major order.
+    attach = rng.random((step_config.n_add, current_nodes)) < step_config.p_add
+    new_idx, existing_nodes = np.nonzero(attach)
+    added_edges = np.column_stack([new_idx + current_nodes, existing_nodes]).astype(int)
+
+    if timestamped:
+        new_nodes = list(new_nodes)
+        added_edges = np.hstack([added_edges, np.full((len(added_edges), 1), current_time)])
+        if removed_edges.shape[1] == 2:
+            removed_edges = np.hstack([removed_edges, np.full((len(removed_edges), 1), current_time)])
+
+    # Combine existing and new edges
+    if len(added_edges) > 0:
+        edges = np.vstack([edges, added_edges]) if len(edges) > 0 else added_edges
+
+    # Identify completely disconnected nodes
+    if degrees is None:
+        removed_nodes = original_nodes - set(edges[:, :2].flatten())
+    else:
+        removed_nodes = dropped_nodes - degrees.add(added_edges)
+
+    return edges, new_nodes, removed_nodes, removed_edges, added_edges
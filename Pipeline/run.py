@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+run.py
+
+Builds a dataset of encoded temporal graphs with their ground-truth answers.
+
+Usage (from the repository root):
+    python Pipeline/run.py --graph_type ba --graph_config "n=10,m=2,iterations=8" --samples 1000 --tests 1111
+
+Samples are generated in shards across a process pool and written to
+<out_dir>/shard_XXXXX.jsonl, one JSON record per sample. Shards that are
+already on disk are skipped, so an interrupted run resumes where it stopped.
+Sample i is always generated from the i-th child of SeedSequence(seed), so
+the dataset does not depend on the number of workers.
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+# Add parent directory to path so we can import from other modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Graphs.batch_tgns import generate_tgn
+from Graphs.graph_config import parse_graph_config
+from Encoding.encoding1 import encoding1
+from Encoding.encoding2 import encoding2
+from Encoding.encoding3 import encoding3
+from Utils.ground_truth import (
+    get_node_first_appearance,
+    time_steps_most_connected,
+    time_steps_least_connected,
+    nodes_with_most_edge_changes
+)
+
+ENCODINGS = {
+    "encoding1": encoding1,
+    "encoding2": encoding2,
+    "encoding3": encoding3,
+}
+
+# Order of the tests in the --tests bitstring
+TESTS = [
+    "node_first_appearance",
+    "time_steps_most_connected",
+    "time_steps_least_connected",
+    "nodes_with_most_edge_changes",
+]
+
+def safe_int(val):
+    return int(val) if hasattr(val, '__int__') else val
+
+def safe_pair_list(pairs):
+    return [[safe_int(a), safe_int(b)] for a, b in pairs]
+
+def parse_tests(bitstring):
+    if len(bitstring) != len(TESTS) or set(bitstring) - {"0", "1"}:
+        raise ValueError(f"--tests must be a bitstring of length {len(TESTS)} ({', '.join(TESTS)})")
+    return [test for test, bit in zip(TESTS, bitstring) if bit == "1"]
+
+def run_tests(tgn, tests, node):
+    answers = {}
+    if "node_first_appearance" in tests:
+        answers["node_first_appearance"] = safe_int(get_node_first_appearance(tgn, node))
+    if "time_steps_most_connected" in tests:
+        answers["time_steps_most_connected"] = [safe_int(x) for x in time_steps_most_connected(tgn)]
+    if "time_steps_least_connected" in tests:
+        answers["time_steps_least_connected"] = [safe_int(x) for x in time_steps_least_connected(tgn)]
+    if "nodes_with_most_edge_changes" in tests:
+        answers["nodes_with_most_edge_changes"] = safe_pair_list(nodes_with_most_edge_changes(tgn))
+    return answers
+
+def build_sample(index, graph_config, tests, encodings, seed):
+    rng = np.random.default_rng(seed)
+    tgn = generate_tgn(graph_config.graph_type, graph_config.graph_params,
+                       graph_config.step_config, graph_config.iterations, rng)
+
+    # Node asked about in the first-appearance question, drawn from every node the graph ever had
+    all_nodes = sorted(set().union(*(snapshot["nodes"] for snapshot in tgn)))
+    node = safe_int(rng.choice(all_nodes)) if all_nodes else 0
+
+    return {
+        "sample": index,
+        "node_query": node,
+        "encodings": {name: ENCODINGS[name](tgn) for name in encodings},
+        "ground_truth": run_tests(tgn, tests, node),
+    }
+
+def shard_path(out_dir, shard):
+    return os.path.join(out_dir, f"shard_{shard:05d}.jsonl")
+
+def build_shard(shard, start, seeds, graph_config, tests, encodings, out_dir):
+    # Worker entry point: build one shard and write it atomically
+    path = shard_path(out_dir, shard)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        for offset, seed in enumerate(seeds):
+            f.write(json.dumps(build_sample(start + offset, graph_config, tests, encodings, seed)) + "\n")
+    os.replace(tmp_path, path)
+    return path
+
+def write_manifest(out_dir, manifest):
+    # A resumed run must use the same settings as the shards already on disk
+    path = os.path.join(out_dir, "manifest.json")
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            existing = json.load(f)
+        if existing != manifest:
+            raise ValueError(f"{path} was written with different settings; use a new --out_dir")
+        return
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a dataset of encoded TGNs with ground-truth answers")
+    parser.add_argument("--graph_type", required=True, help="ba, er, complete, activity, sbm or bursty")
+    parser.add_argument("--graph_config", default="",
+                        help='Comma-separated key=value pairs, e.g. "n=10,m=2,p_add=0.3,iterations=8"')
+    parser.add_argument("--samples", type=int, required=True, help="Number of samples to generate")
+    parser.add_argument("--tests", default="1" * len(TESTS),
+                        help=f"Bitstring selecting the tests to run, in order: {', '.join(TESTS)}")
+    parser.add_argument("--encodings", default=",".join(ENCODINGS),
+                        help="Comma-separated encodings to emit")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--shard_size", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out_dir", default=None, help="Defaults to Data/datasets/<graph_type>")
+    args = parser.parse_args()
+
+    graph_config = parse_graph_config(args.graph_type, args.graph_config)
+    tests = parse_tests(args.tests)
+    encodings = [name.strip() for name in args.encodings.split(",") if name.strip()]
+    unknown = set(encodings) - set(ENCODINGS)
+    if unknown:
+        parser.error(f"Unknown encoding(s): {', '.join(sorted(unknown))}")
+
+    out_dir = args.out_dir or os.path.join("Data/datasets", args.graph_type)
+    os.makedirs(out_dir, exist_ok=True)
+    write_manifest(out_dir, {
+        "graph_config": graph_config.to_dict(),
+        "samples": args.samples,
+        "tests": tests,
+        "encodings": encodings,
+        "seed": args.seed,
+        "shard_size": args.shard_size,
+    })
+
+    seeds = np.random.SeedSequence(args.seed).spawn(args.samples)
+    n_shards = (args.samples + args.shard_size - 1) // args.shard_size
+    pending = [shard for shard in range(n_shards) if not os.path.exists(shard_path(out_dir, shard))]
+    print(f"{n_shards - len(pending)}/{n_shards} shards already done, generating {len(pending)}")
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = []
+        for shard in pending:
+            start = shard * args.shard_size
+            futures.append(pool.submit(
+                build_shard, shard, start, seeds[start:start + args.shard_size],
+                graph_config, tests, encodings, out_dir,
+            ))
+        for done, future in enumerate(as_completed(futures), start=1):
+            print(f"[{done}/{len(pending)}] Saved {future.result()}")
+
+if __name__ == "__main__":
+    main()
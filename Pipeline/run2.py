@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 import sys
 import os
-import pickle
 from pathlib import Path
 
 # Add parent directory to path so we can import from other modules
@@ -9,13 +8,14 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import encoding2
 from Encoding.encoding2 import encoding2
+from Utils.artifact_cache import cached_call
+from Utils.tgn_store import load_tgn
 
 def encode_and_save(file_path, encoding_func):
     print(f"Loading TGN from {file_path}")
-    with open(file_path, 'rb') as f:
-        tgn = pickle.load(f)
+    tgn = load_tgn(file_path)
 
-    embedding = encoding_func(tgn)
+    embedding = cached_call(encoding_func, tgn)
 
     output_path = f"Data/embeddings/{Path(file_path).stem}_encoding2.txt"
     with open(output_path, 'w') as f:
@@ -0,0 +1,72 @@
+"""
+CSR adjacency of a single snapshot, for neighbor and degree queries.
+
+Node ids stay the raw ids of the snapshot (hospital ids are sparse), so the
+rows are indexed through the sorted array of nodes that have an edge:
+
+    neighbors of nodes[i] = indices[indptr[i]:indptr[i + 1]]   (sorted)
+
+Edges are treated as undirected and deduplicated through their canonical
+keys, so both orientations of an edge count once.
+"""
+
+import numpy as np
+
+from Utils.edge_keys import unique_keys, keys_to_edges
+
+
+class CSRAdjacency:
+    __slots__ = ("nodes", "indptr", "indices")
+
+    def __init__(self, nodes, indptr, indices):
+        self.nodes = nodes
+        self.indptr = indptr
+        self.indices = indices
+
+    @classmethod
+    def from_edges(cls, edges):
+        lo, hi = keys_to_edges(unique_keys(edges)).T
+        loops = lo == hi
+        src = np.concatenate([lo, hi[~loops]])
+        dst = np.concatenate([hi, lo[~loops]])
+        order = np.lexsort((dst, src))
+        src, dst = src[order], dst[order]
+        nodes, counts = np.unique(src, return_counts=True)
+        indptr = np.concatenate([[0], np.cumsum(counts)])
+        return cls(nodes, indptr, dst)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def _rows(self, nodes):
+        # Row of each queried node, -1 for nodes without edges in this snapshot
+        nodes = np.asarray(nodes, dtype=np.int64)
+        if len(self.nodes) == 0:
+            return np.full(len(nodes), -1)
+        rows = np.minimum(np.searchsorted(self.nodes, nodes), len(self.nodes) - 1)
+        return np.where(self.nodes[rows] == nodes, rows, -1)
+
+    def neighbors(self, node):
+        """Sorted neighbor ids of one node (empty if it has no edges)."""
+        row = int(self._rows([node])[0])
+        if row < 0:
+            return self.indices[:0]
+        return self.indices[self.indptr[row]:self.indptr[row + 1]]
+
+    def degree(self, node):
+        return int(self.degrees([node])[0])
+
+    def degrees(self, nodes=None):
+        """Degree of every queried node (default: of self.nodes, in order)."""
+        per_row = np.diff(self.indptr)
+        if nodes is None:
+            return per_row
+        rows = self._rows(nodes)
+        if len(per_row) == 0:
+            return np.zeros(len(rows), dtype=np.int64)
+        return np.where(rows >= 0, per_row[rows], 0)
+
+    def has_edge(self, u, v):
+        neighbors = self.neighbors(u)
+        i = np.searchsorted(neighbors, v)
+        return bool(i < len(neighbors) and neighbors[i] == v)
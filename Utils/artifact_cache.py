@@ -0,0 +1,231 @@
+"""
+Content-addressed on-disk cache for derived artifacts (encodings, answers).
+
+Entries are keyed by a sha256 over
+    - the canonical bytes of the TGN (its edge arrays and node sets, or a
+      TemporalGraph's event log),
+    - the source of the module defining the function that derived the
+      artifact and of every project module it imports, directly or through
+      other project modules, so editing an encoder or a helper it relies on
+      (temporal_graph.py, edge_keys.py, ...) invalidates its entries,
+    - any extra parameters (e.g. the queried node).
+An unchanged graph run through an unchanged function is then served from
+disk on rerun. The cache is bounded in bytes and evicts the least recently
+used entries first.
+
+    embedding = cached_call(encoding3, tgn)
+    first = cached_call(get_node_first_appearance, tgn, node)
+
+The cache lives in .tgn_cache/ at the repository root unless TGN_CACHE_DIR
+points elsewhere; TGN_CACHE_DIR=off disables it. Project modules imported
+only inside a function body are not followed; after changing one of those,
+empty the cache with
+    python Utils/artifact_cache.py --clear
+
+Usage:
+    python Utils/artifact_cache.py            prints the cache's size
+    python Utils/artifact_cache.py --clear    removes every entry
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sys
+import types
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Utils.edge_keys import as_edge_array
+from Utils.temporal_graph import TemporalGraph
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DIR = os.path.join(REPO_ROOT, ".tgn_cache")
+DEFAULT_MAX_BYTES = 1 << 30
+
+
+def tgn_digest(tgn):
+    """sha256 of a TGN's array bytes; node sets are hashed sorted, so set iteration order doesn't matter."""
+    h = hashlib.sha256()
+    if isinstance(tgn, TemporalGraph):
+        h.update(b"temporal-graph")
+        h.update(np.ascontiguousarray(tgn.events).tobytes())
+        h.update(np.ascontiguousarray(tgn.offsets).tobytes())
+        h.update(bytes([tgn.timestamped, tgn.initial_added]))
+        return h.hexdigest()
+
+    h.update(b"snapshots")
+    for snapshot in tgn:
+        for field in ("edges", "added_edges", "removed_edges"):
+            edges = as_edge_array(snapshot.get(field, []))
+            h.update(str(edges.shape).encode())
+            h.update(np.ascontiguousarray(edges).tobytes())
+        for field in ("nodes", "new_nodes", "removed_nodes"):
+            nodes = np.array(sorted(int(n) for n in snapshot.get(field, [])), dtype=np.int64)
+            h.update(str(len(nodes)).encode())
+            h.update(nodes.tobytes())
+    return h.hexdigest()
+
+
+def file_digest(path):
+    """sha256 of a file's bytes, to key arguments loaded from it (e.g. a roles file)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _project_module(obj):
+    """The repository module obj is or was defined in, or None (stdlib, numpy, ...)."""
+    module = obj if isinstance(obj, types.ModuleType) else sys.modules.get(getattr(obj, "__module__", None) or "")
+    path = getattr(module, "__file__", None)
+    if path is None or not os.path.abspath(path).startswith(REPO_ROOT + os.sep):
+        return None
+    return module
+
+
+def project_dependencies(module):
+    """module and every project module reachable through its globals (imported modules, functions, classes)."""
+    seen = {module.__name__: module}
+    stack = [module]
+    while stack:
+        for value in list(vars(stack.pop()).values()):
+            dependency = _project_module(value)
+            if dependency is not None and dependency.__name__ not in seen:
+                seen[dependency.__name__] = dependency
+                stack.append(dependency)
+    return [seen[name] for name in sorted(seen)]
+
+
+def code_digest(func):
+    """
+    sha256 of a function's qualified name, the source of its module and the
+    source of every project module that module depends on (project_dependencies).
+    """
+    h = hashlib.sha256(f"{func.__module__}.{func.__qualname__}".encode())
+    module = inspect.getmodule(func)
+    for dependency in project_dependencies(module) if module is not None else []:
+        try:
+            source = inspect.getsource(dependency)
+        except (OSError, TypeError):
+            source = ""
+        h.update(f"\n{dependency.__name__}\n{source}".encode())
+    return h.hexdigest()
+
+
+def cache_key(func, tgn_hash, *args, **params):
+    payload = json.dumps([code_digest(func), tgn_hash, list(args), params], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ArtifactCache:
+    """Pickled values in <root>/<key[:2]>/<key>.pkl, LRU-evicted by access time."""
+
+    def __init__(self, root=DEFAULT_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], f"{key}.pkl")
+
+    def get(self, key, default=None):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return default
+        # Mark as recently used
+        os.utime(path)
+        return value
+
+    def put(self, key, value):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith(".pkl"):
+                    path = os.path.join(dirpath, name)
+                    stat = os.stat(path)
+                    entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+    def size(self):
+        """(number of entries, total bytes)."""
+        sizes = [os.path.getsize(os.path.join(dirpath, name))
+                 for dirpath, _, filenames in os.walk(self.root) for name in filenames if name.endswith(".pkl")]
+        return len(sizes), sum(sizes)
+
+    def clear(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(dirpath, name))
+
+
+_MISSING = object()
+
+
+def default_cache():
+    root = os.environ.get("TGN_CACHE_DIR", DEFAULT_DIR)
+    return None if root == "off" else ArtifactCache(root)
+
+
+def cached_call(func, tgn, *args, cache=_MISSING, tgn_hash=None, args_key=None, **params):
+    """
+    func(tgn, *args, **params), served from the cache when the same TGN went
+    through the same function with the same arguments before. Pass tgn_hash
+    to reuse a digest across several calls on one graph, and args_key (e.g.
+    the file_digest of the file they were loaded from) for arguments that
+    are objects rather than plain values; it is keyed in place of args.
+    """
+    if cache is _MISSING:
+        cache = default_cache()
+    if cache is None:
+        return func(tgn, *args, **params)
+
+    key_args = args if args_key is None else (args_key,)
+    key = cache_key(func, tgn_hash or tgn_digest(tgn), *key_args, **params)
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        value = func(tgn, *args, **params)
+        cache.put(key, value)
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or empty the artifact cache")
+    parser.add_argument("--dir", default=os.environ.get("TGN_CACHE_DIR", DEFAULT_DIR), help="Cache directory")
+    parser.add_argument("--clear", action="store_true", help="Remove every cached entry")
+    args = parser.parse_args()
+
+    cache = ArtifactCache(args.dir)
+    entries, size = cache.size()
+    if args.clear:
+        cache.clear()
+        print(f"Removed {entries} entries ({size} bytes) from {args.dir}")
+    else:
+        print(f"{args.dir}: {entries} entries, {size} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Edge-interval table: every stretch of steps an edge was present for.
+
+A TGN boils down to intervals [start, end) per canonical edge key, where
+start is the step the edge appeared at and end the step it was removed at
+(n_steps if it was never removed). An edge that comes back gets one interval
+per appearance. The table is built once from the event log with a sort over
+the edge events, after which "active at t", "active during [a, b]" and the
+active-edge count of every step are vectorized queries.
+
+The event log is derived from consecutive edge arrays, so an edge removed
+and re-added within one step (BA steps reuse the ids of nodes that lost all
+their edges) leaves no trace in it. Snapshot dicts still say so through
+their stored removed_edges / added_edges, and from_tgn splits the edge's
+interval at that step; a TemporalGraph (or a .tgn store) has no stored
+diffs, so there the edge counts as present throughout.
+"""
+
+import numpy as np
+
+from Utils.edge_keys import edge_keys, unique_keys
+from Utils.temporal_graph import TemporalGraph, EDGE_ADD, EDGE_REMOVE
+
+
+class EdgeIntervals:
+    """
+    keys, start, end: one entry per interval, sorted by (key, start)
+    n_steps: number of steps of the TGN; open intervals end there
+    """
+
+    __slots__ = ("keys", "start", "end", "n_steps")
+
+    def __init__(self, keys, start, end, n_steps):
+        keys = np.asarray(keys, dtype=np.int64)
+        start = np.asarray(start, dtype=np.int64)
+        end = np.asarray(end, dtype=np.int64)
+        order = np.lexsort((start, keys))
+        self.keys = keys[order]
+        self.start = start[order]
+        self.end = end[order]
+        self.n_steps = int(n_steps)
+
+    @classmethod
+    def from_tgn(cls, tgn):
+        """
+        Build from a TemporalGraph, or from any list / stream of snapshot dicts
+        (whose stored same-step removals and re-additions are kept, see above).
+        """
+        readded = []
+        if not isinstance(tgn, TemporalGraph):
+            tgn = TemporalGraph.from_snapshots(_record_readded(tgn, readded))
+        events = tgn.events
+        steps = np.repeat(np.arange(len(tgn)), np.diff(tgn.offsets))
+        is_edge = (events["op"] == EDGE_ADD) | (events["op"] == EDGE_REMOVE)
+        events, steps = events[is_edge], steps[is_edge]
+        keys = edge_keys(np.column_stack([events["src"], events["dst"]]))
+        ops = events["op"]
+        if readded:
+            # A removal and an addition at the step the edge was re-added at
+            readded_keys = np.concatenate([keys for _, keys in readded])
+            readded_steps = np.concatenate([np.full(len(keys), t) for t, keys in readded])
+            keys = np.concatenate([keys, readded_keys, readded_keys])
+            steps = np.concatenate([steps, readded_steps, readded_steps])
+            ops = np.concatenate([ops, np.full(len(readded_keys), EDGE_REMOVE, dtype=ops.dtype),
+                                  np.full(len(readded_keys), EDGE_ADD, dtype=ops.dtype)])
+
+        # Sorted by key, then step, with removals before additions inside a
+        # step, every addition is followed by the removal that closes it (if any)
+        order = np.lexsort((ops != EDGE_REMOVE, steps, keys))
+        keys, ops, steps = keys[order], ops[order], steps[order]
+        # Both orientations of an edge (as in tgn.pkl) are one event
+        repeated = np.r_[False, (keys[1:] == keys[:-1]) & (steps[1:] == steps[:-1]) & (ops[1:] == ops[:-1])]
+        keys, ops, steps = keys[~repeated], ops[~repeated], steps[~repeated]
+        adds = np.flatnonzero(ops == EDGE_ADD)
+        nxt = np.minimum(adds + 1, len(keys) - 1)
+        closed = (adds + 1 < len(keys)) & (keys[nxt] == keys[adds]) & (ops[nxt] == EDGE_REMOVE)
+        end = np.where(closed, steps[nxt], len(tgn))
+        return cls(keys[adds], steps[adds], end, len(tgn))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def active_at(self, t):
+        """Sorted keys of the edges present at step t."""
+        return np.unique(self.keys[(self.start <= t) & (t < self.end)])
+
+    def active_during(self, a, b):
+        """Sorted keys of the edges present at some step in [a, b]."""
+        return np.unique(self.keys[(self.start <= b) & (a < self.end)])
+
+    def active_counts(self):
+        """Number of intervals covering each step, via a difference array."""
+        start = np.clip(self.start, 0, self.n_steps)
+        end = np.clip(np.maximum(self.end, self.start), 0, self.n_steps)
+        diff = np.bincount(start, minlength=self.n_steps + 1) - np.bincount(end, minlength=self.n_steps + 1)
+        return np.cumsum(diff[:self.n_steps])
+
+    def first_added(self):
+        """(keys, step) of the first appearance of every edge."""
+        keys, first = np.unique(self.keys, return_index=True)
+        return keys, self.start[first]
+
+    def last_removed(self):
+        """(keys, step) of the last removal of every edge, -1 if it never left."""
+        keys, first = np.unique(self.keys, return_index=True)
+        closed = np.where(self.end < self.n_steps, self.end, -1)
+        if len(keys) == 0:
+            return keys, closed
+        return keys, np.maximum.reduceat(closed, first)
+
+
+def _record_readded(tgn, readded):
+    # Pass the snapshots through, appending (step, keys) of the edges present
+    # before and after a step that the step's stored diffs remove and add again
+    previous = None
+    for t, snapshot in enumerate(tgn):
+        keys = unique_keys(snapshot["edges"])
+        if previous is not None and len(snapshot.get("removed_edges", [])) > 0:
+            both = np.intersect1d(unique_keys(snapshot["removed_edges"]), unique_keys(snapshot.get("added_edges", [])))
+            both = both[np.isin(both, previous) & np.isin(both, keys)]
+            if len(both) > 0:
+                readded.append((t, both))
+        previous = keys
+        yield snapshot
@@ -0,0 +1,76 @@
+"""
+Canonical int64 keys for undirected edges.
+
+An edge (u, v) is packed as (min(u, v) << 32) | max(u, v), so (u, v) and
+(v, u) get the same key whatever orientation a generator emitted, and sets
+of edges become sorted int64 arrays. Differences, membership and counting
+then run through np.setdiff1d / np.isin / np.unique instead of hashing one
+Python tuple per edge. Node ids must be non-negative and below 2**31.
+"""
+
+import numpy as np
+
+SHIFT = np.int64(32)
+MASK = np.int64((1 << 32) - 1)
+
+
+def as_edge_array(edges):
+    """
+    Edges as an (E, k) int64 array with k >= 2, from a numpy array, a list
+    of rows or a set of tuples (the added/removed edges in hospital.pkl).
+    Extra columns such as timestamps are kept.
+    """
+    if isinstance(edges, np.ndarray):
+        array = edges
+    else:
+        array = np.array(list(edges))
+    if array.size == 0:
+        return np.empty((0, 2), dtype=np.int64)
+    return array.astype(np.int64, copy=False)
+
+
+def edge_keys(edges):
+    """One canonical int64 key per edge row (orientation-free)."""
+    edges = as_edge_array(edges)
+    u, v = edges[:, 0], edges[:, 1]
+    return (np.minimum(u, v) << SHIFT) | np.maximum(u, v)
+
+
+def keys_to_edges(keys):
+    """Inverse of edge_keys: (E, 2) array of [min, max] rows."""
+    keys = np.asarray(keys, dtype=np.int64)
+    return np.column_stack([keys >> SHIFT, keys & MASK])
+
+
+def unique_keys(edges):
+    """Sorted, deduplicated keys of an edge collection."""
+    return np.unique(edge_keys(edges))
+
+
+def edge_isin(edges, other):
+    """Boolean mask of the rows of `edges` that also appear in `other`."""
+    if len(edges) == 0:
+        return np.zeros(0, dtype=bool)
+    return np.isin(edge_keys(edges), edge_keys(other))
+
+
+def edge_difference(edges, other):
+    """Rows of `edges` whose edge is not in `other`, in their original order."""
+    edges = as_edge_array(edges)
+    if len(edges) == 0 or len(other) == 0:
+        return edges
+    return edges[~edge_isin(edges, other)]
+
+
+def diff_keys(previous_keys, current_keys):
+    """(added, removed) keys between two sorted, unique key arrays."""
+    added = np.setdiff1d(current_keys, previous_keys, assume_unique=True)
+    removed = np.setdiff1d(previous_keys, current_keys, assume_unique=True)
+    return added, removed
+
+
+def endpoint_counts(*edge_sets):
+    """(nodes, counts): how many edge rows each node is an endpoint of, over all sets."""
+    arrays = [as_edge_array(edges)[:, :2].ravel() for edges in edge_sets]
+    endpoints = np.concatenate(arrays) if arrays else np.empty(0, dtype=np.int64)
+    return np.unique(endpoints, return_counts=True)
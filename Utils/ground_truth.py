@@ -1,5 +1,10 @@
 import pickle
 
+import numpy as np
+
+from Utils.edge_keys import endpoint_counts
+from Utils.temporal_graph import TemporalGraph
+
 def get_node_first_appearance(tgn, node):
     for t, snapshot in enumerate(tgn):
         if node in snapshot["nodes"]:
@@ -9,8 +14,7 @@ def get_node_first_appearance(tgn, node):
 def time_steps_most_connected(tgn):
     max_connections = 0
     best_times = []
-    for t, snapshot in enumerate(tgn):
-        edge_count = len(snapshot["edges"])
+    for t, edge_count in enumerate(_edge_counts(tgn)):
         if edge_count > max_connections:
             max_connections = edge_count
             best_times = [t]
@@ -21,8 +25,7 @@ def time_steps_most_connected(tgn):
 def time_steps_least_connected(tgn):
     min_connections = float('inf')
     worst_times = []
-    for t, snapshot in enumerate(tgn):
-        edge_count = len(snapshot["edges"])
+    for t, edge_count in enumerate(_edge_counts(tgn)):
         if edge_count < min_connections:
             min_connections = edge_count
             worst_times = [t]
@@ -32,19 +35,66 @@ def time_steps_least_connected(tgn):
 
 
 def nodes_with_most_edge_changes(tgn):
-    edge_changes = {}
-    for snapshot in tgn:
-        for edge in snapshot["added_edges"]:
-            for node in edge[:2]:
-                edge_changes[node] = edge_changes.get(node, 0) + 1
-        for edge in snapshot["removed_edges"]:
-            for node in edge[:2]:
-                edge_changes[node] = edge_changes.get(node, 0) + 1
-
-    if not edge_changes:
+    if isinstance(tgn, TemporalGraph):
+        src, dst = tgn.edge_changes()
+        return _most_changes(*np.unique(np.concatenate([src, dst]).astype(np.int64), return_counts=True))
+    # Count every endpoint of every added/removed edge in one np.unique pass
+    nodes, counts = endpoint_counts(*(
+        edges for snapshot in tgn for edges in (snapshot["added_edges"], snapshot["removed_edges"])
+    ))
+    return _most_changes(nodes, counts)
+
+def _edge_counts(tgn):
+    # A TemporalGraph answers from its event log without materializing snapshots
+    if isinstance(tgn, TemporalGraph):
+        return tgn.edge_counts().tolist()
+    return (len(snapshot["edges"]) for snapshot in tgn)
+
+def _most_changes(nodes, counts):
+    if len(counts) == 0:
         return []
+    max_changes = counts.max()
+    best = counts == max_changes
+    return list(zip(nodes[best].tolist(), counts[best].tolist()))
+
+
+
+
+def ground_truth_stream(tgn, node):
+    # Computes all four answers in a single pass, so tgn can be a generator
+    # (iter_tgn / iter_er_tgn / iter_complete_tgn) that is never held in memory.
+    first_appearance = None
+    max_connections, best_times = 0, []
+    min_connections, worst_times = float('inf'), []
+    # Edge-change count of every node id, grown as higher ids show up
+    change_counts = np.zeros(16, dtype=np.int64)
+
+    for t, snapshot in enumerate(tgn):
+        if first_appearance is None and node in snapshot["nodes"]:
+            first_appearance = t
+
+        edge_count = len(snapshot["edges"])
+        if edge_count > max_connections:
+            max_connections, best_times = edge_count, [t]
+        elif edge_count == max_connections:
+            best_times.append(t)
+        if edge_count < min_connections:
+            min_connections, worst_times = edge_count, [t]
+        elif edge_count == min_connections:
+            worst_times.append(t)
 
-    max_changes = max(edge_changes.values())
-    return [(node, count) for node, count in edge_changes.items() if count == max_changes]
+        # Fold this step's endpoint counts into the running totals, touching only its changes
+        nodes, counts = endpoint_counts(snapshot["added_edges"], snapshot["removed_edges"])
+        if len(nodes) > 0 and nodes[-1] >= len(change_counts):
+            change_counts = np.concatenate([change_counts, np.zeros(max(len(change_counts), nodes[-1] + 1), dtype=np.int64)])
+        change_counts[nodes] += counts
 
+    change_nodes = np.flatnonzero(change_counts)
+    most_changes = _most_changes(change_nodes, change_counts[change_nodes])
 
+    return {
+        "node_first_appearance": first_appearance,
+        "time_steps_most_connected": best_times,
+        "time_steps_least_connected": worst_times,
+        "nodes_with_most_edge_changes": most_changes,
+    }
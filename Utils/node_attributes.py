@@ -0,0 +1,121 @@
+"""
+Columnar categorical node attributes (e.g. the hospital roles MED, ADM, NUR, PAT).
+
+A CategoricalAttribute stores one small integer code per node, aligned with
+a NodeIndex, plus the tuple of category names the codes point into. Looking
+up the attribute of any array of node ids is a searchsorted and a gather,
+so a role-filtered subgraph is a boolean mask over an edge array that
+already exists (a snapshot's "edges", or a TemporalGraph's events) instead
+of a filtered copy of the graph:
+
+    roles = CategoricalAttribute.load("hospital/hospital_roles.npz")
+    mask = roles.edge_mask(snapshot["edges"], "PAT", ["MED", "NUR", "ADM"])
+
+Stored as .npz with the raw ids, the codes and the category names.
+"""
+
+import numpy as np
+
+from Utils.node_index import NodeIndex
+
+# Code of nodes the attribute does not know
+MISSING = -1
+
+
+def code_dtype(n_categories):
+    """Smallest signed integer dtype holding codes 0..n_categories-1 and MISSING."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories - 1 <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    raise ValueError(f"Too many categories: {n_categories}")
+
+
+class CategoricalAttribute:
+    __slots__ = ("index", "codes", "categories")
+
+    def __init__(self, index, codes, categories):
+        # codes[i] is the category of dense node i, as a position in categories
+        self.index = index
+        self.codes = codes
+        self.categories = tuple(categories)
+
+    @classmethod
+    def from_values(cls, ids, values):
+        """
+        Attribute of node ids from one value per id (ids may repeat, e.g. one
+        row per contact); raises ValueError if a node carries two values.
+        """
+        ids = np.asarray(ids, dtype=np.int64).ravel()
+        categories, codes = np.unique(np.asarray(values).ravel(), return_inverse=True)
+        pairs = np.unique(np.column_stack([ids, codes]), axis=0)
+        index = NodeIndex.from_ids(pairs[:, 0])
+        if len(pairs) != len(index):
+            conflicting = pairs[np.flatnonzero(pairs[1:, 0] == pairs[:-1, 0]), 0]
+            raise ValueError(f"Nodes with more than one value: {conflicting[:10].tolist()}")
+        return cls(index, pairs[:, 1].astype(code_dtype(len(categories))), [str(c) for c in categories])
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(NodeIndex(data["ids"]), data["codes"], data["categories"].tolist())
+
+    def save(self, path):
+        np.savez(path, ids=self.index.ids, codes=self.codes, categories=np.array(self.categories))
+
+    def __len__(self):
+        return len(self.index)
+
+    def code(self, category):
+        """Code of a category name; raises KeyError for unknown names."""
+        try:
+            return self.categories.index(category)
+        except ValueError:
+            raise KeyError(f"Unknown category: {category}") from None
+
+    def codes_of(self, nodes):
+        """Codes of raw node ids, MISSING for nodes without the attribute."""
+        nodes = np.asarray(nodes, dtype=np.int64)
+        if len(self.index) == 0:
+            return np.full(nodes.shape, MISSING, dtype=self.codes.dtype)
+        dense = np.minimum(np.searchsorted(self.index.ids, nodes), len(self.index) - 1)
+        return np.where(self.index.ids[dense] == nodes, self.codes[dense], MISSING).astype(self.codes.dtype)
+
+    def values_of(self, nodes):
+        """Category names of raw node ids (None for nodes without the attribute)."""
+        names = np.array(self.categories + (None,), dtype=object)
+        return names[self.codes_of(nodes)]
+
+    def node_mask(self, nodes, categories):
+        """Boolean mask of the nodes whose value is one of categories (a name or a list of names)."""
+        return self._member(self.codes_of(nodes), categories)
+
+    def pair_mask(self, src, dst, categories, other=None):
+        """
+        Boolean mask of the (src, dst) pairs with one endpoint in categories
+        and the other in other (categories again if None), in either orientation.
+        """
+        other = categories if other is None else other
+        src, dst = self.codes_of(src), self.codes_of(dst)
+        return ((self._member(src, categories) & self._member(dst, other))
+                | (self._member(src, other) & self._member(dst, categories)))
+
+    def edge_mask(self, edges, categories, other=None):
+        """pair_mask over the rows of an edge array (a snapshot's "edges")."""
+        edges = np.asarray(edges)
+        if len(edges) == 0:
+            return np.zeros(0, dtype=bool)
+        return self.pair_mask(edges[:, 0], edges[:, 1], categories, other)
+
+    def event_mask(self, tgn, categories, other=None):
+        """pair_mask over a TemporalGraph's events; node events match if their node is in either side."""
+        other = categories if other is None else other
+        src, dst = tgn.events["src"], tgn.events["dst"]
+        codes = self.codes_of(src)
+        is_node = dst < 0
+        return np.where(is_node, self._member(codes, categories) | self._member(codes, other),
+                        self.pair_mask(src, np.where(is_node, src, dst), categories, other))
+
+    def _member(self, codes, categories):
+        if isinstance(categories, str):
+            categories = [categories]
+        return np.isin(codes, [self.code(category) for category in categories])
@@ -0,0 +1,101 @@
+"""
+Dense node-id interning.
+
+Raw node ids can be sparse (the hospital ward uses ids like 1157 or 1232),
+which pushes analytics towards dicts keyed by node. NodeIndex maps the raw
+ids of a dataset to dense ids 0..N-1 and back, so per-node state becomes a
+plain array indexed by dense id (np.bincount, boolean masks, ...). The
+mapping is a sorted array of raw ids: encoding is a searchsorted and
+decoding an index, both vectorized, and dense ids keep the raw ids' order.
+
+Interning can also happen at ingestion: intern_snapshots rewrites snapshot
+dicts to dense ids before they are saved, and the index is stored next to
+them (save / load) to map answers back to raw ids.
+"""
+
+import numpy as np
+
+
+class NodeIndex:
+    __slots__ = ("ids",)
+
+    def __init__(self, ids):
+        # Sorted, unique raw ids; dense id i stands for ids[i]
+        self.ids = ids
+
+    @classmethod
+    def load(cls, path):
+        return cls(np.load(path))
+
+    def save(self, path):
+        np.save(path, self.ids)
+
+    @classmethod
+    def from_ids(cls, *id_arrays):
+        arrays = [np.asarray(ids, dtype=np.int64).ravel() for ids in id_arrays]
+        return cls(np.unique(np.concatenate(arrays)) if arrays else np.empty(0, dtype=np.int64))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, raw_id):
+        i = np.searchsorted(self.ids, raw_id)
+        return bool(i < len(self.ids) and self.ids[i] == raw_id)
+
+    def encode(self, raw_ids):
+        """Dense ids of raw ids; raises KeyError for ids that were never interned."""
+        raw_ids = np.asarray(raw_ids, dtype=np.int64)
+        flat = raw_ids.ravel()
+        dense = np.searchsorted(self.ids, flat)
+        known = dense < len(self.ids)
+        known[known] = self.ids[dense[known]] == flat[known]
+        if not known.all():
+            raise KeyError(f"Unknown node ids: {np.unique(flat[~known])[:10].tolist()}")
+        return dense.reshape(raw_ids.shape)
+
+    def decode(self, dense_ids):
+        """Raw ids of dense ids."""
+        return self.ids[np.asarray(dense_ids, dtype=np.int64)]
+
+
+def intern_snapshots(tgn, index=None):
+    """
+    (snapshot dicts with dense node ids, NodeIndex). Every field keeps its
+    container type (sets of ints / tuples, lists, arrays); timestamped edge
+    rows keep their third column. Pass index to share one mapping between
+    several TGNs over the same nodes.
+    """
+    if index is None:
+        index = NodeIndex.from_ids(*(_node_array(snapshot["nodes"]) for snapshot in tgn))
+    interned = []
+    for snapshot in tgn:
+        snapshot = dict(snapshot)
+        for field in ("nodes", "new_nodes", "removed_nodes"):
+            if field in snapshot:
+                nodes = snapshot[field]
+                snapshot[field] = type(nodes)(index.encode(_node_array(nodes)).tolist())
+        for field in ("edges", "added_edges", "removed_edges"):
+            if field in snapshot:
+                snapshot[field] = _intern_edges(snapshot[field], index)
+        interned.append(snapshot)
+    return interned, index
+
+
+def _node_array(nodes):
+    return np.fromiter((int(node) for node in nodes), dtype=np.int64, count=len(nodes))
+
+
+def _intern_edges(edges, index):
+    if isinstance(edges, np.ndarray):
+        if len(edges) == 0:
+            return edges
+        edges = edges.copy()
+        edges[:, :2] = index.encode(edges[:, :2])
+        return edges
+    # Sets / lists of tuples, as hospital.pkl stores its diffs
+    rows = [tuple(int(x) for x in edge) for edge in edges]
+    if not rows:
+        return type(edges)()
+    encoded = np.array(rows, dtype=np.int64)
+    encoded[:, :2] = index.encode(encoded[:, :2])
+    return type(edges)(map(tuple, encoded.tolist()))
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Time-partitioned storage for long TGNs (e.g. multi-day contact datasets).
+
+A partitioned store is a directory with a manifest and one partition per
+time range of steps:
+
+    manifest.json
+    part_00000000_00000012/     steps [0, 12)
+    part_00000012_00000024/     steps [12, 24), ...
+
+Every partition is a regular .tgn store (see tgn_store.py). Partitions after
+the first begin with one extra hidden "base" step that adds the edges active
+just before the partition, so a partition can be opened on its own: reading
+a window only opens the partitions it overlaps, and appending new steps
+writes a new partition and a new manifest without touching earlier ones.
+
+Usage:
+    python Utils/partitioned_store.py hospital/hospital.pkl --steps_per_partition 12
+writes hospital/hospital.parts (12 two-hour bins = one partition per day).
+"""
+
+import argparse
+import bisect
+import json
+import os
+import pickle
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Utils.temporal_graph import TemporalGraph, with_base_step
+from Utils.tgn_store import save_tgn, open_tgn
+
+FORMAT = "tgn-partitioned"
+VERSION = 1
+SUFFIX = ".parts"
+
+
+def write_partitioned(tgn, path, steps_per_partition):
+    """Write a whole TGN (snapshot dicts or TemporalGraph) as partitions of steps_per_partition steps."""
+    if not isinstance(tgn, TemporalGraph):
+        tgn = TemporalGraph.from_snapshots(tgn)
+    if os.path.exists(os.path.join(path, "manifest.json")):
+        raise FileExistsError(f"{path} already holds a partitioned store; use append_partition")
+    os.makedirs(path, exist_ok=True)
+    manifest = {
+        "format": FORMAT,
+        "version": VERSION,
+        "n_steps": 0,
+        "timestamped": tgn.timestamped,
+        "initial_added": tgn.initial_added,
+        "partitions": [],
+    }
+    for start in range(0, len(tgn), steps_per_partition):
+        stop = min(start + steps_per_partition, len(tgn))
+        base = tgn.edges_at(start - 1) if start > 0 else None
+        events = tgn.events[tgn.offsets[start]:tgn.offsets[stop]]
+        offsets = tgn.offsets[start:stop + 1] - tgn.offsets[start]
+        part = TemporalGraph(events, offsets, tgn.timestamped, tgn.initial_added and start == 0)
+        _write_partition(path, manifest, start, stop, part if base is None else with_base_step(base, part))
+    return path
+
+
+def append_partition(path, snapshots):
+    """
+    Append snapshot dicts continuing the stored history as one new partition.
+    Their changes are taken relative to the last stored step: edge changes are
+    derived from the edge arrays anyway, and the first snapshot's new_nodes /
+    removed_nodes are recomputed against the last stored step's nodes (a batch
+    written on its own starts with empty change sets).
+    """
+    store = PartitionedTGN(path)
+    manifest = store.manifest
+    start = len(store)
+    base = store.edges_at(start - 1) if start > 0 else None
+    snapshots = list(snapshots)
+    if base is None:
+        part = TemporalGraph.from_snapshots(snapshots)
+        manifest.update(timestamped=part.timestamped, initial_added=part.initial_added)
+    else:
+        if snapshots:
+            last_nodes = store[start - 1]["nodes"]
+            nodes = {int(node) for node in snapshots[0]["nodes"]}
+            snapshots[0] = dict(snapshots[0], new_nodes=sorted(nodes - last_nodes),
+                                removed_nodes=sorted(last_nodes - nodes))
+        empty = {"nodes": set(), "new_nodes": set(), "removed_nodes": set(), "added_edges": set(), "removed_edges": set()}
+        part = TemporalGraph.from_snapshots([dict(empty, edges=base)] + snapshots)
+        part.initial_added = False
+    _write_partition(path, manifest, start, start + len(part) - (base is not None), part)
+    return path
+
+
+def _write_partition(path, manifest, start, stop, part):
+    name = f"part_{start:08d}_{stop:08d}"
+    save_tgn(part, os.path.join(path, name))
+    manifest["partitions"].append({"name": name, "start": start, "stop": stop})
+    manifest["n_steps"] = stop
+    tmp_path = os.path.join(path, "manifest.json.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(path, "manifest.json"))
+
+
+class PartitionedTGN:
+    """
+    Read side of a partitioned store. Indexing and iteration yield the usual
+    snapshot dicts with global step numbers; partitions are memory-mapped on
+    first use, and only the ones a query touches are opened.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "manifest.json")) as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("format") != FORMAT or self.manifest.get("version") != VERSION:
+            raise ValueError(f"{path} is not a {FORMAT} v{VERSION} store")
+        self.starts = [p["start"] for p in self.manifest["partitions"]]
+        self._open = {}
+
+    def __len__(self):
+        return self.manifest["n_steps"]
+
+    def _partition(self, i):
+        if i not in self._open:
+            self._open[i] = open_tgn(os.path.join(self.path, self.manifest["partitions"][i]["name"]))
+        return self._open[i]
+
+    def _locate(self, t):
+        # (partition, local step) of global step t; partitions after the first
+        # start with their hidden base step
+        if t < 0:
+            t += len(self)
+        if not 0 <= t < len(self):
+            raise IndexError("PartitionedTGN index out of range")
+        i = bisect.bisect_right(self.starts, t) - 1
+        return self._partition(i), t - self.starts[i] + (self.starts[i] > 0)
+
+    def __getitem__(self, t):
+        if isinstance(t, slice):
+            return self.window(*t.indices(len(self))[:2])
+        part, local = self._locate(t)
+        return part.snapshot_at(local)
+
+    def __iter__(self):
+        for t in range(len(self)):
+            yield self[t]
+
+    def edges_at(self, t):
+        part, local = self._locate(t)
+        return part.edges_at(local)
+
+    def window(self, a, b):
+        """Snapshot dicts of steps [a, b), opening only the partitions they fall in."""
+        return [self[t] for t in range(a, min(b, len(self)))]
+
+    def edge_counts(self, a=0, b=None):
+        """Edge counts of steps [a, b) straight from the partitions' stored counts."""
+        b = len(self) if b is None else min(b, len(self))
+        counts = [np.empty(0, dtype=np.int64)]
+        for i, info in enumerate(self.manifest["partitions"]):
+            lo, hi = max(a, info["start"]), min(b, info["stop"])
+            if lo < hi:
+                shift = info["start"] - (info["start"] > 0)
+                counts.append(np.asarray(self._partition(i).edge_counts()[lo - shift:hi - shift]))
+        return np.concatenate(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a TGN pickle into a time-partitioned store")
+    parser.add_argument("pickle", help="Pickled TGN to convert")
+    parser.add_argument("--steps_per_partition", type=int, default=12, help="Steps (bins) per partition")
+    parser.add_argument("--out", default=None, help="Output directory (default: <pickle stem>.parts)")
+    args = parser.parse_args()
+
+    with open(args.pickle, "rb") as f:
+        tgn = pickle.load(f)
+    out = args.out or os.path.splitext(args.pickle)[0] + SUFFIX
+    write_partitioned(tgn, out, args.steps_per_partition)
+    print(f"Wrote {out} ({len(tgn)} steps, {args.steps_per_partition} per partition)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Zero-copy sharing of a TemporalGraph with worker processes.
+
+SharedTGN copies a graph's event log (events, offsets and edge counts) into
+multiprocessing.shared_memory blocks once. Pickling a SharedTGN only sends
+the block names and the graph's flags, and unpickling attaches to the same
+memory, so handing one to a ProcessPoolExecutor gives every worker a
+TemporalGraph over the single stored copy:
+
+    with SharedTGN.create(load_tgn("hospital/hospital.pkl")) as shared:
+        with ProcessPoolExecutor() as pool:
+            answers = list(pool.map(answer, [shared] * n_jobs, nodes))
+
+    def answer(shared, node):
+        return get_node_first_appearance(shared.graph, node)
+
+Each process keeps its own replay caches (checkpoints, adjacency), so only
+the event log is shared. The creating process owns the memory: leaving the
+with block (or calling unlink()) frees it, while workers only close().
+
+Every array over a block holds a buffer export on it, so a block is only
+unmapped once nothing uses it anymore: close() / unlink() raise BufferError
+while a graph taken from .graph (or any array derived from it) is still
+alive, and .graph raises ValueError once the SharedTGN has been released.
+"""
+
+import ctypes
+import gc
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from Utils.temporal_graph import TemporalGraph, EVENT_DTYPE
+
+# Arrays shared per graph and their dtypes
+ARRAYS = {"events": EVENT_DTYPE, "offsets": np.dtype(np.int64), "edge_counts": np.dtype(np.int64)}
+
+
+class SharedTGN:
+    """
+    graph: TemporalGraph whose events / offsets / edge counts live in shared memory
+    owner: whether this process created the blocks (and unlinks them)
+    """
+
+    def __init__(self, blocks, meta, owner=False):
+        self._blocks = blocks
+        self.meta = meta
+        self.owner = owner
+        arrays = {name: _shared_array(blocks[name], dtype, meta["lengths"][name]) for name, dtype in ARRAYS.items()}
+        if not owner:
+            for array in arrays.values():
+                array.flags.writeable = False
+        self._graph = TemporalGraph(arrays["events"], arrays["offsets"], meta["timestamped"], meta["initial_added"])
+        self._graph.set_edge_counts(arrays["edge_counts"])
+
+    @property
+    def graph(self):
+        if self._graph is None:
+            raise ValueError("SharedTGN has been closed")
+        return self._graph
+
+    @classmethod
+    def create(cls, tgn):
+        """Copy a TGN (snapshot dicts or TemporalGraph) into new shared memory blocks."""
+        if not isinstance(tgn, TemporalGraph):
+            tgn = TemporalGraph.from_snapshots(tgn)
+        sources = {"events": tgn.events, "offsets": tgn.offsets, "edge_counts": tgn.edge_counts()}
+        blocks = {}
+        try:
+            for name, dtype in ARRAYS.items():
+                source = np.asarray(sources[name], dtype=dtype)
+                # Zero-size blocks are not allowed
+                blocks[name] = shared_memory.SharedMemory(create=True, size=max(source.nbytes, 1))
+                np.ndarray(source.shape, dtype=dtype, buffer=blocks[name].buf)[:] = source
+        except BaseException:
+            for block in blocks.values():
+                block.close()
+                block.unlink()
+            raise
+        meta = {
+            "names": {name: block.name for name, block in blocks.items()},
+            "lengths": {name: len(sources[name]) for name in ARRAYS},
+            "timestamped": tgn.timestamped,
+            "initial_added": tgn.initial_added,
+        }
+        return cls(blocks, meta, owner=True)
+
+    @classmethod
+    def attach(cls, meta):
+        """Attach to the blocks described by another SharedTGN's meta, without copying."""
+        blocks = {name: shared_memory.SharedMemory(name=block_name) for name, block_name in meta["names"].items()}
+        return cls(blocks, meta)
+
+    def __reduce__(self):
+        # Workers receive the block names and attach instead of unpickling the arrays
+        return SharedTGN.attach, (self.meta,)
+
+    def close(self):
+        """
+        Drop this process's mapping. Raises BufferError (keeping the mapping)
+        while arrays over it are still referenced; close again once they are gone.
+        """
+        self._release(unlink=False)
+
+    def unlink(self):
+        """Free the shared memory (owner only) and close; see close() for BufferError."""
+        self._release(unlink=self.owner)
+
+    def _release(self, unlink, collect=True):
+        self._graph = None
+        if unlink:
+            # Removing the names is safe while mappings exist; the memory goes with the last one
+            for block in self._blocks.values():
+                block.unlink()
+            self.owner = False
+        in_use = {}
+        for name, block in self._blocks.items():
+            try:
+                block.close()
+            except BufferError:
+                if not collect:
+                    in_use[name] = block
+                    continue
+                # Arrays in a reference cycle only go away on collection
+                gc.collect()
+                try:
+                    block.close()
+                except BufferError:
+                    in_use[name] = block
+        self._blocks = in_use
+        if in_use:
+            raise BufferError(f"Shared {', '.join(in_use)} arrays are still referenced; "
+                              "drop the graph taken from .graph before closing")
+
+    def __del__(self):
+        # Copies unpickled by workers are dropped without close(); release
+        # their graph first so the blocks can be closed quietly
+        try:
+            self._release(unlink=False, collect=False)
+        except (AttributeError, BufferError):
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.unlink()
+
+
+def _shared_array(block, dtype, length):
+    # The ctypes view holds a buffer export on the block for as long as any
+    # array over it is alive, so closing the block raises BufferError instead
+    # of unmapping memory that arrays still point into
+    view = (ctypes.c_char * block.size).from_buffer(block.buf)
+    return np.frombuffer(view, dtype=dtype, count=length)
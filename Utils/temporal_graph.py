@@ -0,0 +1,341 @@
+"""
+Columnar container for temporal graphs.
+
+A TGN has so far been a list of snapshot dicts whose field types depend on
+the generator (numpy arrays, sets, ranges, lists, sets of tuples). The
+TemporalGraph below stores the whole history as one contiguous event array
+plus per-step offsets instead:
+
+    events[offsets[t]:offsets[t + 1]]   -> everything that happened at step t
+
+Each event is (src, dst, t, op) with op one of EDGE_ADD, EDGE_REMOVE,
+NODE_ADD, NODE_REMOVE (node events use dst = -1). t is the step of the event,
+except for the edges of timestamped graphs where it is the row's own third
+column (the step the edge was added at). Indexing and iterating a
+TemporalGraph still yields the usual snapshot dicts, so the encoders and
+ground-truth functions accept it unchanged.
+"""
+
+import pickle
+
+import numpy as np
+
+from Utils.adjacency import CSRAdjacency
+from Utils.edge_keys import as_edge_array, edge_keys, edge_isin
+from Utils.node_index import NodeIndex
+
+EDGE_ADD = 1
+EDGE_REMOVE = -1
+NODE_ADD = 2
+NODE_REMOVE = -2
+
+EVENT_DTYPE = np.dtype([("src", np.int32), ("dst", np.int32), ("t", np.int32), ("op", np.int8)])
+
+
+class TemporalGraph:
+    """
+    events: structured array with fields src, dst, t, op (EVENT_DTYPE)
+    offsets: int64 array of length T + 1 delimiting each step's events
+    timestamped: whether edge rows carry a third column with the step they
+        were added at, like the ER / complete generators produce
+    initial_added: whether snapshot 0 reports its edges and nodes as added,
+        as hospital.pkl does (the synthetic generators report nothing)
+    checkpoint_every: keep the full edge array of every k-th step once it has
+        been replayed (or loaded with set_checkpoints, as open_tgn does), so
+        snapshot_at(t) replays at most k - 1 steps of events instead of the
+        whole history
+    adjacency_cache: how many per-snapshot CSR adjacencies adjacency(t) keeps
+
+    Edge events within a step are ordered removals first, then additions, in
+    the row order of the source snapshots, so replaying them rebuilds each
+    snapshot's edge array in the order step_graph produced it. Sources that
+    rebuild every edge array from a set (hospital.pkl) get the same rows back,
+    kept rows first and new rows after.
+    """
+
+    __slots__ = ("events", "offsets", "timestamped", "initial_added", "checkpoint_every",
+                 "adjacency_cache", "_cached", "_checkpoints", "_adjacency", "_edge_counts")
+
+    def __init__(self, events, offsets, timestamped=False, initial_added=False, checkpoint_every=64,
+                 adjacency_cache=16):
+        self.events = events
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.timestamped = bool(timestamped)
+        self.initial_added = bool(initial_added)
+        self.checkpoint_every = int(checkpoint_every)
+        self.adjacency_cache = int(adjacency_cache)
+        # Edge arrays of steps 0, k, 2k, ... filled in as the replay passes them
+        self._checkpoints = []
+        # Last materialized (t, edges) so sequential access replays one step at a time
+        self._cached = None
+        # Step -> CSRAdjacency, oldest first, trimmed to adjacency_cache entries
+        self._adjacency = {}
+        self._edge_counts = None
+
+    # --- Construction -------------------------------------------------------
+
+    @classmethod
+    def from_snapshots(cls, tgn):
+        """Build from a list of snapshot dicts (any of the existing pickles, or a DeltaTGN)."""
+        chunks = []
+        offsets = [0]
+        timestamped = False
+        initial_added = False
+        previous = np.empty((0, 2), dtype=np.int64)
+
+        for t, snapshot in enumerate(tgn):
+            edges = as_edge_array(snapshot["edges"])
+            if t == 0:
+                timestamped = edges.shape[1] > 2
+                initial_added = len(snapshot["added_edges"]) > 0 or len(snapshot["new_nodes"]) > 0
+                # The initial node set can hold isolated nodes (networkx ER graphs)
+                step_chunks = [
+                    _node_events(snapshot["nodes"], t, NODE_ADD),
+                    _edge_events(edges, t, EDGE_ADD),
+                ]
+            else:
+                # Derive the changes from consecutive edge arrays, so the replay
+                # reproduces exactly these arrays whatever the source stored
+                step_chunks = [
+                    _node_events(snapshot["new_nodes"], t, NODE_ADD),
+                    _node_events(snapshot["removed_nodes"], t, NODE_REMOVE),
+                    _edge_events(previous[~_row_isin(previous, edges)], t, EDGE_REMOVE),
+                    _edge_events(edges[~_row_isin(edges, previous)], t, EDGE_ADD),
+                ]
+            chunks.extend(step_chunks)
+            offsets.append(offsets[-1] + sum(len(chunk) for chunk in step_chunks))
+            previous = edges
+
+        events = np.concatenate(chunks) if chunks else np.empty(0, dtype=EVENT_DTYPE)
+        return cls(events, offsets, timestamped, initial_added)
+
+    def interned(self):
+        """
+        (TemporalGraph with dense node ids 0..N-1, NodeIndex to map them back).
+        Node ids keep their order, so sorted outputs decode to sorted raw ids.
+        """
+        src, dst = self.events["src"], self.events["dst"]
+        index = NodeIndex.from_ids(src, dst[dst >= 0])
+        events = np.array(self.events)
+        events["src"] = index.encode(src)
+        events["dst"] = np.where(dst >= 0, index.encode(np.where(dst >= 0, dst, src)), -1)
+        tgn = TemporalGraph(events, self.offsets, self.timestamped, self.initial_added,
+                            self.checkpoint_every, self.adjacency_cache)
+        tgn._edge_counts = self._edge_counts
+        return tgn, index
+
+    def to_snapshots(self):
+        """Materialize every snapshot as a list of dicts."""
+        return list(self)
+
+    # --- Sequence protocol ----------------------------------------------------
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        edges = None
+        for t in range(len(self)):
+            edges = self._apply(edges, t)
+            self._checkpoint(t, edges)
+            yield self._snapshot(t, edges)
+
+    def __getitem__(self, t):
+        if isinstance(t, slice):
+            return [self[i] for i in range(*t.indices(len(self)))]
+        if t < 0:
+            t += len(self)
+        if not 0 <= t < len(self):
+            raise IndexError("TemporalGraph index out of range")
+        return self.snapshot_at(t)
+
+    # --- Queries --------------------------------------------------------------
+
+    def step_events(self, t):
+        return self.events[self.offsets[t]:self.offsets[t + 1]]
+
+    def snapshot_at(self, t):
+        """Snapshot dict at step t, rebuilt from the closest checkpoint."""
+        return self._snapshot(t, self.edges_at(t))
+
+    def edges_at(self, t):
+        """
+        Edge array at step t. Replays from the latest checkpoint at or before t,
+        or from the last materialized step when that is closer, so random access
+        costs O(k * changes per step) and sequential access one step each.
+        """
+        start, edges = -1, None
+        if self._checkpoints:
+            i = min(t // self.checkpoint_every, len(self._checkpoints) - 1)
+            start, edges = i * self.checkpoint_every, self._checkpoints[i]
+        if self._cached is not None and start < self._cached[0] <= t:
+            start, edges = self._cached
+        for step in range(start + 1, t + 1):
+            edges = self._apply(edges, step)
+            self._checkpoint(step, edges)
+        self._cached = (t, edges)
+        return edges
+
+    def adjacency(self, t):
+        """CSR adjacency of snapshot t, built on first use and cached."""
+        if t < 0:
+            t += len(self)
+        if t in self._adjacency:
+            self._adjacency[t] = self._adjacency.pop(t)
+        else:
+            self._adjacency[t] = CSRAdjacency.from_edges(self.edges_at(t))
+            while len(self._adjacency) > self.adjacency_cache:
+                del self._adjacency[next(iter(self._adjacency))]
+        return self._adjacency[t]
+
+    def neighbors(self, node, t):
+        return self.adjacency(t).neighbors(node)
+
+    def degrees(self, t, nodes=None):
+        return self.adjacency(t).degrees(nodes)
+
+    def edge_counts(self):
+        """Number of edges in every snapshot, straight from the event log."""
+        if self._edge_counts is not None:
+            return self._edge_counts
+        ops = self.events["op"]
+        delta = (ops == EDGE_ADD).astype(np.int64) - (ops == EDGE_REMOVE)
+        # Running edge total after every event; a step's count is the total at its end offset,
+        # which also holds for steps without events (unlike reduceat over the offsets)
+        running = np.concatenate([[0], np.cumsum(delta)])
+        self._edge_counts = running[self.offsets[1:]]
+        return self._edge_counts
+
+    def set_edge_counts(self, edge_counts):
+        """Use precomputed edge counts (e.g. stored next to the events on disk)."""
+        self._edge_counts = edge_counts
+
+    def checkpoints(self):
+        """Edge arrays of steps 0, k, 2k, ..., replaying the log once if some are still missing."""
+        n = (len(self) + self.checkpoint_every - 1) // self.checkpoint_every
+        if len(self._checkpoints) < n:
+            self.edges_at((n - 1) * self.checkpoint_every)
+        return self._checkpoints
+
+    def set_checkpoints(self, checkpoints):
+        """Use precomputed checkpoints (e.g. stored next to the events on disk), one per checkpoint_every steps."""
+        self._checkpoints = list(checkpoints)
+
+    def edge_changes(self):
+        """(src, dst) arrays of every edge event counted as a change by the ground truth."""
+        ops = self.events["op"]
+        changes = (ops == EDGE_ADD) | (ops == EDGE_REMOVE)
+        if not self.initial_added:
+            changes[self.offsets[0]:self.offsets[1]] = False
+        return self.events["src"][changes], self.events["dst"][changes]
+
+    @property
+    def nbytes(self):
+        return self.events.nbytes + self.offsets.nbytes
+
+    # --- Replay ---------------------------------------------------------------
+
+    def _rows(self, events):
+        columns = [events["src"], events["dst"]]
+        if self.timestamped:
+            columns.append(events["t"])
+        return np.column_stack(columns).astype(np.int64) if len(events) > 0 else np.empty((0, len(columns)), dtype=np.int64)
+
+    def _checkpoint(self, t, edges):
+        # Checkpoints are appended in order, so index i always holds step i * k
+        if t % self.checkpoint_every == 0 and t // self.checkpoint_every == len(self._checkpoints):
+            self._checkpoints.append(edges)
+
+    def _apply(self, edges, t):
+        events = self.step_events(t)
+        ops = events["op"]
+        added = self._rows(events[ops == EDGE_ADD])
+        if edges is None:
+            return added
+        removed = events[ops == EDGE_REMOVE]
+        if len(removed) > 0:
+            edges = edges[~_row_isin(edges, self._rows(removed))]
+        return np.vstack([edges, added]) if len(added) > 0 else edges
+
+    def _snapshot(self, t, edges):
+        events = self.step_events(t)
+        ops = events["op"]
+        if t == 0:
+            nodes = set(events["src"][ops == NODE_ADD].tolist())
+            if not self.initial_added:
+                return {
+                    "edges": edges,
+                    "nodes": nodes,
+                    "new_nodes": set(),
+                    "removed_nodes": set(),
+                    "removed_edges": set(),
+                    "added_edges": set()
+                }
+            return {
+                "edges": edges,
+                "nodes": nodes,
+                "new_nodes": set(nodes),
+                "removed_nodes": set(),
+                "removed_edges": self._rows(events[:0]),
+                "added_edges": edges
+            }
+        return {
+            "edges": edges,
+            "nodes": set(edges[:, :2].ravel().tolist()),
+            "new_nodes": events["src"][ops == NODE_ADD].tolist(),
+            "removed_nodes": events["src"][ops == NODE_REMOVE].tolist(),
+            "removed_edges": self._rows(events[ops == EDGE_REMOVE]),
+            "added_edges": self._rows(events[ops == EDGE_ADD])
+        }
+
+
+def with_base_step(base_edges, tgn):
+    """
+    The events of tgn preceded by one extra step that adds base_edges, so a
+    slice of a longer history (whose first step is a delta) can be replayed
+    on its own. Step i of tgn becomes step i + 1 of the result.
+    """
+    base_step = TemporalGraph.from_snapshots([{"edges": base_edges, "nodes": set(), "added_edges": set(), "new_nodes": set()}])
+    events = np.concatenate([base_step.events, tgn.events])
+    offsets = np.concatenate([base_step.offsets, tgn.offsets[1:] + base_step.offsets[-1]])
+    return TemporalGraph(events, offsets, tgn.timestamped, False)
+
+
+def load_tgn_pickle(path):
+    """Load one of the existing ba*/er*/complete*/hospital pickles as a TemporalGraph."""
+    with open(path, "rb") as f:
+        return TemporalGraph.from_snapshots(pickle.load(f))
+
+
+def _row_isin(edges, other):
+    # Like edge_isin, but timestamped rows also have to agree on their third
+    # column: an ER edge removed and redrawn in the same step is a new row
+    if edges.shape[1] < 3 or len(edges) == 0 or len(other) == 0:
+        return edge_isin(edges, other)
+    rows = np.vstack([
+        np.column_stack([edge_keys(edges), edges[:, 2]]),
+        np.column_stack([edge_keys(other), other[:, 2]]),
+    ])
+    _, inverse = np.unique(rows, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    return np.isin(inverse[:len(edges)], inverse[len(edges):])
+
+
+def _edge_events(edges, t, op):
+    events = np.empty(len(edges), dtype=EVENT_DTYPE)
+    events["src"] = edges[:, 0]
+    events["dst"] = edges[:, 1]
+    # Timestamped rows keep their own third column (ER removals carry the add time)
+    events["t"] = edges[:, 2] if edges.shape[1] > 2 else t
+    events["op"] = op
+    return events
+
+
+def _node_events(nodes, t, op):
+    nodes = np.fromiter((int(n) for n in nodes), dtype=np.int64)
+    events = np.empty(len(nodes), dtype=EVENT_DTYPE)
+    events["src"] = nodes
+    events["dst"] = -1
+    events["t"] = t
+    events["op"] = op
+    return events
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Compressed archive format for TGN event logs.
+
+The event log of a TemporalGraph is cut into blocks of block_steps steps.
+Every block is self-contained: it starts with a checkpoint of the edges
+active before its first step, followed by the block's events, so a reader
+seeks to the block holding step t through the index and decodes only that
+block. Inside a block every column is made small before zlib sees it:
+
+    per-step event counts     varint
+    ops                       one byte each
+    src                       zigzag varint of the delta to the previous src
+    dst (edge events only)    zigzag varint of dst - src
+    t (timestamped edges)     zigzag varint of step - t
+
+File layout: blocks, then a JSON index (graph flags and per-block step
+range, byte offset and length), then an 8-byte little-endian offset of the
+index, then MAGIC.
+
+Usage:
+    python Utils/tgn_archive.py ba1.pkl er1.pkl ...
+writes <name>.tgnz next to each pickle.
+"""
+
+import argparse
+import json
+import os
+import pickle
+import sys
+import zlib
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Utils.temporal_graph import TemporalGraph, with_base_step, EVENT_DTYPE, EDGE_ADD, EDGE_REMOVE, NODE_REMOVE
+
+MAGIC = b"TGNZ0001"
+SUFFIX = ".tgnz"
+# Ops are stored as op - OP_BIAS so every code fits an unsigned byte
+OP_BIAS = min(EDGE_REMOVE, NODE_REMOVE)
+
+
+# --- Varint / zigzag ----------------------------------------------------------
+
+def zigzag(values):
+    values = np.asarray(values, dtype=np.int64)
+    return ((values << 1) ^ (values >> 63)).astype(np.uint64)
+
+
+def unzigzag(values):
+    values = np.asarray(values, dtype=np.uint64)
+    return ((values >> np.uint64(1)).astype(np.int64)) ^ -((values & np.uint64(1)).astype(np.int64))
+
+
+def encode_varints(values):
+    """LEB128 bytes of non-negative integers, vectorized over the whole array."""
+    values = np.asarray(values, dtype=np.uint64)
+    if len(values) == 0:
+        return b""
+    shifts = np.arange(10, dtype=np.uint64) * np.uint64(7)
+    groups = ((values[:, None] >> shifts) & np.uint64(0x7F)).astype(np.uint8)
+    # Number of 7-bit groups each value needs (at least one)
+    n_bytes = 1 + (values[:, None] >> shifts[1:] > 0).sum(axis=1)
+    groups[np.arange(10) < (n_bytes[:, None] - 1)] |= 0x80
+    return groups[np.arange(10) < n_bytes[:, None]].tobytes()
+
+
+def decode_varints(buf, count, pos=0):
+    """(values, position after them) of `count` varints read from buf at pos."""
+    data = np.frombuffer(buf, dtype=np.uint8, offset=pos)
+    if count == 0:
+        return np.empty(0, dtype=np.uint64), pos
+    ends = np.flatnonzero(data < 0x80)[:count]
+    used = ends[-1] + 1
+    data = data[:used]
+    starts = np.concatenate([[0], ends[:-1] + 1])
+    value_of = np.repeat(np.arange(count), ends - starts + 1)
+    shift = (np.arange(used) - starts[value_of]).astype(np.uint64) * np.uint64(7)
+    parts = (data & 0x7F).astype(np.uint64) << shift
+    return np.add.reduceat(parts, starts), pos + int(used)
+
+
+# --- Blocks -------------------------------------------------------------------
+
+def _encode_rows(src, dst, t, steps):
+    # src as deltas, dst relative to src, t relative to the event's step
+    src = np.asarray(src, dtype=np.int64)
+    parts = [encode_varints(zigzag(np.diff(src, prepend=0)))]
+    parts.append(encode_varints(zigzag(np.asarray(dst, dtype=np.int64) - src)))
+    parts.append(encode_varints(zigzag(np.asarray(steps, dtype=np.int64) - t)) if t is not None else b"")
+    return parts
+
+
+def _encode_block(tgn, start, stop, level):
+    base = tgn.edges_at(start - 1) if start > 0 else np.empty((0, 3 if tgn.timestamped else 2), dtype=np.int64)
+    events = tgn.events[tgn.offsets[start]:tgn.offsets[stop]]
+    counts = np.diff(tgn.offsets[start:stop + 1])
+    steps = np.repeat(np.arange(start, stop), counts)
+    is_edge = (events["op"] == EDGE_ADD) | (events["op"] == EDGE_REMOVE)
+
+    parts = [encode_varints([len(base)])]
+    parts += _encode_rows(base[:, 0], base[:, 1], base[:, 2] if tgn.timestamped else None, np.full(len(base), start))
+    parts.append(encode_varints(counts))
+    parts.append((events["op"] - OP_BIAS).astype(np.uint8).tobytes())
+    parts.append(encode_varints(zigzag(np.diff(events["src"].astype(np.int64), prepend=0))))
+    src = events["src"][is_edge].astype(np.int64)
+    parts.append(encode_varints(zigzag(events["dst"][is_edge] - src)))
+    parts.append(encode_varints(zigzag(steps[is_edge] - events["t"][is_edge])) if tgn.timestamped else b"")
+
+    header = encode_varints([len(p) for p in parts])
+    return zlib.compress(header + b"".join(parts), level)
+
+
+def _decode_block(payload, info, timestamped):
+    raw = zlib.decompress(payload)
+    lengths, pos = decode_varints(raw, 9)
+    chunks = []
+    for length in lengths.astype(np.int64):
+        chunks.append(raw[pos:pos + length])
+        pos += length
+    (n_base,), _ = decode_varints(chunks[0], 1)
+    n_base = int(n_base)
+    start, n_steps = info["start"], info["stop"] - info["start"]
+
+    src = np.cumsum(unzigzag(decode_varints(chunks[1], n_base)[0]))
+    dst = src + unzigzag(decode_varints(chunks[2], n_base)[0])
+    columns = [src, dst]
+    if timestamped:
+        columns.append(start - unzigzag(decode_varints(chunks[3], n_base)[0]))
+    base = np.column_stack(columns) if n_base > 0 else np.empty((0, len(columns)), dtype=np.int64)
+
+    counts = decode_varints(chunks[4], n_steps)[0].astype(np.int64)
+    ops = np.frombuffer(chunks[5], dtype=np.uint8).astype(np.int8) + np.int8(OP_BIAS)
+    n_events = len(ops)
+    events = np.empty(n_events, dtype=EVENT_DTYPE)
+    events["op"] = ops
+    events["src"] = np.cumsum(unzigzag(decode_varints(chunks[6], n_events)[0]))
+    steps = np.repeat(np.arange(start, start + n_steps), counts)
+    is_edge = (ops == EDGE_ADD) | (ops == EDGE_REMOVE)
+    n_edges = int(is_edge.sum())
+    events["dst"] = -1
+    events["dst"][is_edge] = events["src"][is_edge] + unzigzag(decode_varints(chunks[7], n_edges)[0])
+    events["t"] = steps
+    if timestamped:
+        events["t"][is_edge] = steps[is_edge] - unzigzag(decode_varints(chunks[8], n_edges)[0])
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    return base, events, offsets
+
+
+# --- Writing / reading --------------------------------------------------------
+
+def write_archive(tgn, path, block_steps=64, level=9):
+    """Write a TGN (snapshot dicts or TemporalGraph) as a block-compressed archive."""
+    if not isinstance(tgn, TemporalGraph):
+        tgn = TemporalGraph.from_snapshots(tgn)
+    index = {
+        "n_steps": len(tgn),
+        "timestamped": tgn.timestamped,
+        "initial_added": tgn.initial_added,
+        "blocks": [],
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        for start in range(0, len(tgn), block_steps):
+            stop = min(start + block_steps, len(tgn))
+            payload = _encode_block(tgn, start, stop, level)
+            index["blocks"].append({"start": start, "stop": stop, "offset": f.tell(), "length": len(payload)})
+            f.write(payload)
+        index_offset = f.tell()
+        f.write(json.dumps(index).encode())
+        f.write(index_offset.to_bytes(8, "little"))
+        f.write(MAGIC)
+    os.replace(tmp_path, path)
+    return path
+
+
+class TGNArchive:
+    """
+    Read side of an archive. Indexing decodes only the block holding the step
+    (keeping the last decoded block), and iteration decodes blocks in order.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(size - 16)
+            tail = f.read(16)
+            if tail[8:] != MAGIC:
+                raise ValueError(f"{path} is not a TGN archive")
+            index_offset = int.from_bytes(tail[:8], "little")
+            f.seek(index_offset)
+            self.index = json.loads(f.read(size - 16 - index_offset))
+        self.starts = [block["start"] for block in self.index["blocks"]]
+        self._block = None
+
+    def __len__(self):
+        return self.index["n_steps"]
+
+    def _open_block(self, i):
+        # TemporalGraph of block i; blocks after the first carry their checkpoint as a hidden base step
+        if self._block is None or self._block[0] != i:
+            info = self.index["blocks"][i]
+            with open(self.path, "rb") as f:
+                f.seek(info["offset"])
+                payload = f.read(info["length"])
+            base, events, offsets = _decode_block(payload, info, self.index["timestamped"])
+            graph = TemporalGraph(events, offsets, self.index["timestamped"], self.index["initial_added"] and i == 0)
+            self._block = (i, graph if info["start"] == 0 else with_base_step(base, graph))
+        return self._block[1]
+
+    def _locate(self, t):
+        if t < 0:
+            t += len(self)
+        if not 0 <= t < len(self):
+            raise IndexError("TGNArchive index out of range")
+        i = int(np.searchsorted(self.starts, t, side="right")) - 1
+        return self._open_block(i), t - self.starts[i] + (self.starts[i] > 0)
+
+    def __getitem__(self, t):
+        if isinstance(t, slice):
+            return [self[i] for i in range(*t.indices(len(self)))]
+        graph, local = self._locate(t)
+        return graph.snapshot_at(local)
+
+    def __iter__(self):
+        for t in range(len(self)):
+            yield self[t]
+
+    def edges_at(self, t):
+        graph, local = self._locate(t)
+        return graph.edges_at(local)
+
+    def to_temporal_graph(self):
+        """Decode every block back into one TemporalGraph."""
+        events, offsets = [], [np.zeros(1, dtype=np.int64)]
+        with open(self.path, "rb") as f:
+            for info in self.index["blocks"]:
+                f.seek(info["offset"])
+                _, block_events, block_offsets = _decode_block(f.read(info["length"]), info, self.index["timestamped"])
+                events.append(block_events)
+                offsets.append(block_offsets[1:] + offsets[-1][-1])
+        events = np.concatenate(events) if events else np.empty(0, dtype=EVENT_DTYPE)
+        return TemporalGraph(events, np.concatenate(offsets), self.index["timestamped"], self.index["initial_added"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compress TGN pickles into block-indexed .tgnz archives")
+    parser.add_argument("pickles", nargs="+", help="Pickled TGN files to archive")
+    parser.add_argument("--block_steps", type=int, default=64, help="Steps per independently decodable block")
+    args = parser.parse_args()
+
+    for path in args.pickles:
+        with open(path, "rb") as f:
+            tgn = pickle.load(f)
+        out = write_archive(tgn, os.path.splitext(path)[0] + SUFFIX, args.block_steps)
+        print(f"Archived {path} -> {out} ({os.path.getsize(path)} -> {os.path.getsize(out)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+On-disk format for TemporalGraph, opened with np.load(mmap_mode="r").
+
+A stored TGN is a directory (conventionally <name>.tgn next to <name>.pkl):
+
+    index.json        format version, step / event counts, flags, and the
+                      size / mtime of the pickle it was converted from
+    events.npy        the structured event array (src, dst, t, op)
+    offsets.npy       per-step offsets into events
+    edge_counts.npy   number of edges in every snapshot
+    checkpoints.npy   edge arrays of steps 0, k, 2k, ... stacked row-wise,
+                      split by checkpoint_offsets.npy
+
+Everything is memory-mapped, so reading steps 1000-1100 only touches the
+pages of those events, and edge-count queries only read edge_counts.npy.
+The stored checkpoints make the first tgn[t] on a freshly opened store
+replay at most k - 1 steps instead of the whole history up to t.
+
+Usage:
+    python Utils/tgn_store.py ba1.pkl er1.pkl hospital/hospital.pkl
+converts each pickle into a .tgn directory alongside it.
+"""
+
+import argparse
+import json
+import os
+import pickle
+import shutil
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Utils.temporal_graph import TemporalGraph
+
+FORMAT = "tgn-columnar"
+VERSION = 1
+SUFFIX = ".tgn"
+
+
+def save_tgn(tgn, path, source=None):
+    """
+    Write a TGN (list of snapshot dicts, DeltaTGN or TemporalGraph) to the
+    directory `path`. The directory is written next to its final location and
+    swapped in at the end, so an interrupted save never leaves a partial store.
+    source is the pickle the TGN was converted from; its size and mtime are
+    recorded so load_tgn can tell when the pickle has been regenerated since.
+    """
+    if not isinstance(tgn, TemporalGraph):
+        tgn = TemporalGraph.from_snapshots(tgn)
+
+    tmp_path = f"{path}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    np.save(os.path.join(tmp_path, "events.npy"), np.ascontiguousarray(tgn.events))
+    np.save(os.path.join(tmp_path, "offsets.npy"), tgn.offsets)
+    np.save(os.path.join(tmp_path, "edge_counts.npy"), tgn.edge_counts())
+    checkpoints = tgn.checkpoints()
+    width = 3 if tgn.timestamped else 2
+    rows = np.concatenate(checkpoints) if checkpoints else np.empty((0, width), dtype=np.int64)
+    np.save(os.path.join(tmp_path, "checkpoints.npy"), rows.astype(np.int64))
+    np.save(os.path.join(tmp_path, "checkpoint_offsets.npy"), np.cumsum([0] + [len(edges) for edges in checkpoints]))
+    index = {
+        "format": FORMAT,
+        "version": VERSION,
+        "n_steps": len(tgn),
+        "n_events": int(len(tgn.events)),
+        "timestamped": tgn.timestamped,
+        "initial_added": tgn.initial_added,
+        "checkpoint_every": tgn.checkpoint_every,
+    }
+    if source is not None:
+        index["source"] = source_stamp(source)
+    with open(os.path.join(tmp_path, "index.json"), "w") as f:
+        json.dump(index, f, indent=2)
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    return path
+
+
+def open_tgn(path, mmap=True, checkpoint_every=None):
+    """
+    Open a stored TGN as a TemporalGraph backed by memory-mapped arrays. The
+    stored checkpoints are used unless a different checkpoint_every is asked for.
+    """
+    with open(os.path.join(path, "index.json")) as f:
+        index = json.load(f)
+    if index.get("format") != FORMAT or index.get("version") != VERSION:
+        raise ValueError(f"{path} is not a {FORMAT} v{VERSION} store")
+
+    mmap_mode = "r" if mmap else None
+    stored_every = index.get("checkpoint_every")
+    if checkpoint_every is None:
+        checkpoint_every = stored_every or 64
+    tgn = TemporalGraph(
+        np.load(os.path.join(path, "events.npy"), mmap_mode=mmap_mode),
+        np.load(os.path.join(path, "offsets.npy")),
+        timestamped=index["timestamped"],
+        initial_added=index["initial_added"],
+        checkpoint_every=checkpoint_every,
+    )
+    tgn.set_edge_counts(np.load(os.path.join(path, "edge_counts.npy"), mmap_mode=mmap_mode))
+    if checkpoint_every == stored_every:
+        rows = np.load(os.path.join(path, "checkpoints.npy"), mmap_mode=mmap_mode)
+        offsets = np.load(os.path.join(path, "checkpoint_offsets.npy"))
+        tgn.set_checkpoints(np.asarray(rows[a:b]) for a, b in zip(offsets[:-1], offsets[1:]))
+    return tgn
+
+
+def store_path(pickle_path):
+    return os.path.splitext(pickle_path)[0] + SUFFIX
+
+
+def source_stamp(pickle_path):
+    stat = os.stat(pickle_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def is_fresh(store, pickle_path):
+    """Whether the store was converted from pickle_path as it is now (stores without a source stamp are not)."""
+    try:
+        with open(os.path.join(store, "index.json")) as f:
+            return json.load(f).get("source") == source_stamp(pickle_path)
+    except (OSError, ValueError):
+        return False
+
+
+def load_tgn(path):
+    """
+    Load a TGN from any format. For a .pkl path, a converted .tgn store
+    next to it is preferred when it was converted from the pickle as it is
+    now (same size and mtime); a regenerated pickle is loaded as before.
+    Time-partitioned stores (partitioned_store.py) open lazily.
+    """
+    if os.path.isfile(os.path.join(path, "manifest.json")):
+        from Utils.partitioned_store import PartitionedTGN
+        return PartitionedTGN(path)
+    if os.path.isdir(path):
+        return open_tgn(path)
+    converted = store_path(path)
+    if os.path.isdir(converted) and (not os.path.exists(path) or is_fresh(converted, path)):
+        return open_tgn(converted)
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert TGN pickles to memory-mapped .tgn stores")
+    parser.add_argument("pickles", nargs="+", help="Pickled TGN files to convert")
+    args = parser.parse_args()
+
+    for path in args.pickles:
+        with open(path, "rb") as f:
+            tgn = pickle.load(f)
+        out = save_tgn(tgn, store_path(path), source=path)
+        print(f"Converted {path} -> {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,15 @@
 
 import matplotlib.pyplot as plt
+import numpy as np
 import os
 import re
+import sys
+
+# Add parent directory to path so we can import from other modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Utils.edge_intervals import EdgeIntervals
+from Utils.edge_keys import edge_keys
 
 # File paths (update if needed)
 paths = {
@@ -102,7 +110,9 @@ def parse_encoding2(path):
 
 # Function to estimate edge count from encoding3 adjacency lists
 def parse_encoding3(path):
-    edge_counts = {t: 0 for t in time_steps}
+    # Collect every connection as an interval [added, removed), then count the
+    # active ones per step with a difference array instead of looping over steps
+    nodes, neighbors, added, removed = [], [], [], []
     with open(path, "r") as f:
         content = f.read()
 
@@ -114,16 +124,22 @@ def parse_encoding3(path):
         elif line.startswith("- Connected to"):
             parts = re.findall(r"(\d+)", line)
             if len(parts) >= 2:
-                neighbor = int(parts[0])
-                added = int(parts[1])
-                removed = int(parts[2]) if len(parts) > 2 else None
-                for t in time_steps:
-                    if t >= added and (removed is None or t < removed):
-                        edge_counts[t] += 1
-
-    for t in edge_counts:
-        edge_counts[t] //= 2  # undirected
-    return edge_counts
+                nodes.append(current_node)
+                neighbors.append(int(parts[0]))
+                added.append(int(parts[1]))
+                removed.append(int(parts[2]) if len(parts) > 2 else len(time_steps))
+        elif re.match(r"\d+: \[", line):
+            # Current encoding3 layout: "node: [neighbor (t=a, removed t=b), ...]"
+            node = int(line.split(":")[0])
+            for neighbor, t_added, t_removed in re.findall(r"(\d+) \(t=(\d+)(?:, removed t=(\d+))?\)", line):
+                nodes.append(node)
+                neighbors.append(int(neighbor))
+                added.append(int(t_added))
+                removed.append(int(t_removed) if t_removed else len(time_steps))
+
+    keys = edge_keys(np.column_stack([nodes, neighbors])) if nodes else []
+    counts = EdgeIntervals(keys, added, removed, len(time_steps)).active_counts() // 2  # undirected
+    return {t: int(counts[t]) for t in time_steps}
 
 # Parse all encodings
 #enc1_counts = parse_encoding1(paths["encoding1"])
@@ -6,9 +6,15 @@ Generates snapshot-based encoding (Encoding 1) for the hospital contact network.
 """
 
 import os
-import pickle
+import sys
 import numpy as np
 
+# Add parent directory to path so we can import from other modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Utils.artifact_cache import cached_call
+from Utils.tgn_store import load_tgn
+
 # ==== Settings ====
 INPUT_FILE = "hospital.pkl"
 OUTPUT_FILE = "Data/embeddings/hospital_encoding1.txt"
@@ -35,13 +41,12 @@ def main():
         print(f"Input file not found: {INPUT_FILE}")
         return
 
-    with open(INPUT_FILE, "rb") as f:
-        tgn = pickle.load(f)
+    tgn = load_tgn(INPUT_FILE)
 
     print(f"Loaded {INPUT_FILE} with {len(tgn)} snapshots.")
 
     # Encode
-    embedding = encoding1(tgn)
+    embedding = cached_call(encoding1, tgn)
 
     # Ensure output folder exists
     os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
@@ -1,9 +1,15 @@
 #!/usr/bin/env python3
 
 import os
-import pickle
+import sys
 import numpy as np
 
+# Add parent directory to path so we can import from other modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Utils.artifact_cache import cached_call
+from Utils.tgn_store import load_tgn
+
 INPUT_FILE = "hospital.pkl"
 OUTPUT_FILE = "Data/embeddings/hospital_encoding1_2.txt"
 
@@ -26,12 +32,11 @@ def main():
         print(f"Input file not found: {INPUT_FILE}")
         return
 
-    with open(INPUT_FILE, "rb") as f:
-        tgn = pickle.load(f)
+    tgn = load_tgn(INPUT_FILE)
 
     print(f"Loaded {INPUT_FILE} with {len(tgn)} snapshots.")
 
-    embedding = textual_snapshot_encoding(tgn)
+    embedding = cached_call(textual_snapshot_encoding, tgn)
 
     os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
     with open(OUTPUT_FILE, "w") as f:
@@ -7,9 +7,15 @@ Stores results as a horizontally structured JSON file, one line per snapshot.
 """
 
 import os
-import pickle
+import sys
 import json
 
+# Add parent directory to path so we can import from other modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Utils.artifact_cache import cached_call
+from Utils.tgn_store import load_tgn
+
 # === Settings ===
 INPUT_FILE = "hospital.pkl"
 OUTPUT_FILE = "Data/embeddings/hospital_encoding1_json.txt"
@@ -40,12 +46,11 @@ def main():
         print(f"Input file not found: {INPUT_FILE}")
         return
 
-    with open(INPUT_FILE, "rb") as f:
-        tgn = pickle.load(f)
+    tgn = load_tgn(INPUT_FILE)
 
     print(f"Loaded {INPUT_FILE} with {len(tgn)} snapshots.")
 
-    lines = build_snapshot_lines(tgn)
+    lines = cached_call(build_snapshot_lines, tgn)
 
     os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
     with open(OUTPUT_FILE, "w") as f:
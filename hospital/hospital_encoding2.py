@@ -7,9 +7,15 @@ Includes initial graph snapshot and time-based change logs.
 """
 
 import os
-import pickle
+import sys
 import numpy as np
 
+# Add parent directory to path so we can import from other modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Utils.artifact_cache import cached_call
+from Utils.tgn_store import load_tgn
+
 # Settings
 INPUT_FILE = "hospital.pkl"
 OUTPUT_FILE = "Data/embeddings/hospital_encoding2.txt"
@@ -47,12 +53,11 @@ def main():
         print(f"Input file not found: {INPUT_FILE}")
         return
 
-    with open(INPUT_FILE, "rb") as f:
-        tgn = pickle.load(f)
+    tgn = load_tgn(INPUT_FILE)
 
     print(f"Loaded {INPUT_FILE} with {len(tgn)} snapshots.")
 
-    embedding = encoding2(tgn)
+    embedding = cached_call(encoding2, tgn)
 
     os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
 
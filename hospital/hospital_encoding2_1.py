@@ -1,9 +1,15 @@
 #!/usr/bin/env python3
 
 import os
-import pickle
+import sys
 import numpy as np
 
+# Add parent directory to path so we can import from other modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Utils.artifact_cache import cached_call
+from Utils.tgn_store import load_tgn
+
 INPUT_FILE = "hospital.pkl"
 OUTPUT_FILE = "Data/embeddings/hospital_encoding2_1.txt"
 
@@ -23,9 +29,9 @@ def textual_hybrid_encoding(tgn):
         step = tgn[t]
         if step["new_nodes"]:
             embedding += f"t={t}: Added nodes: {display_nodes(step['new_nodes'])}\n"
-        if step["removed_edges"]:
+        if len(step["removed_edges"]) > 0:
             embedding += f"t={t}: Removed edges: {display_edges(step['removed_edges'])}\n"
-        if step["added_edges"]:
+        if len(step["added_edges"]) > 0:
             embedding += f"t={t}: Added edges: {display_edges(step['added_edges'])}\n"
         if step["removed_nodes"]:
             embedding += f"t={t}: Removed nodes: {display_nodes(step['removed_nodes'])}\n"
@@ -37,12 +43,11 @@ def main():
         print(f"Input file not found: {INPUT_FILE}")
         return
 
-    with open(INPUT_FILE, "rb") as f:
-        tgn = pickle.load(f)
+    tgn = load_tgn(INPUT_FILE)
 
     print(f"Loaded {INPUT_FILE} with {len(tgn)} snapshots.")
 
-    embedding = textual_hybrid_encoding(tgn)
+    embedding = cached_call(textual_hybrid_encoding, tgn)
 
     os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
     with open(OUTPUT_FILE, "w") as f:
@@ -1,9 +1,15 @@
 #!/usr/bin/env python3
 
 import os
-import pickle
+import sys
 import json
 
+# Add parent directory to path so we can import from other modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Utils.artifact_cache import cached_call
+from Utils.tgn_store import load_tgn
+
 INPUT_FILE = "hospital.pkl"
 OUTPUT_FILE = "Data/embeddings/hospital_encoding2_json.txt"
 
@@ -39,9 +45,9 @@ def build_hybrid_json(tgn):
             record["added_nodes"] = convert_set(step["new_nodes"])
         if step.get("removed_nodes"):
             record["removed_nodes"] = convert_set(step["removed_nodes"])
-        if step.get("added_edges"):
+        if len(step.get("added_edges", [])) > 0:
             record["added_edges"] = convert_edges(step["added_edges"])
-        if step.get("removed_edges"):
+        if len(step.get("removed_edges", [])) > 0:
             record["removed_edges"] = convert_edges(step["removed_edges"])
 
         snapshots.append(record)
@@ -53,12 +59,11 @@ def main():
         print(f"Input file not found: {INPUT_FILE}")
         return
 
-    with open(INPUT_FILE, "rb") as f:
-        tgn = pickle.load(f)
+    tgn = load_tgn(INPUT_FILE)
 
     print(f"Loaded {INPUT_FILE} with {len(tgn)} snapshots.")
 
-    hybrid_json_lines = build_hybrid_json(tgn)
+    hybrid_json_lines = cached_call(build_hybrid_json, tgn)
 
     os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
     with open(OUTPUT_FILE, "w") as f:
@@ -1,85 +1,48 @@
-import pickle
 import os
+import sys
 import json
 
+import numpy as np
+
+# Add parent directory to path so we can import from other modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Utils.ground_truth import (
+    get_node_first_appearance,
+    time_steps_most_connected,
+    time_steps_least_connected,
+    nodes_with_most_edge_changes
+)
+from Utils.artifact_cache import cached_call, file_digest, tgn_digest
+from Utils.node_attributes import CategoricalAttribute
+from Utils.node_index import NodeIndex
+from Utils.tgn_store import load_tgn
+
 # === Config ===
 INPUT_FILE = "hospital.pkl"
+ROLES_FILE = "hospital_roles.npz"  # written by hospital_to_plk.py --roles; role questions are skipped without it
 OUTPUT_FILE = "Data/results/ground_truth_hospital.json"
 NODE_QUERY = 1100  # Example node to track for appearance (can adjust)
 
 # === Ground Truth Functions ===
-
-def get_node_first_appearance(tgn, node):
-    for t, snapshot in enumerate(tgn):
-        if node in snapshot["nodes"]:
-            return t
-    return None
-
-def time_steps_most_connected(tgn):
-    max_connections = 0
-    best_times = []
-    for t, snapshot in enumerate(tgn):
-        edge_count = len(snapshot["edges"])
-        if edge_count > max_connections:
-            max_connections = edge_count
-            best_times = [t]
-        elif edge_count == max_connections:
-            best_times.append(t)
-    return best_times
-
-def time_steps_least_connected(tgn):
-    min_connections = float('inf')
-    worst_times = []
-    for t, snapshot in enumerate(tgn):
-        edge_count = len(snapshot["edges"])
-        if edge_count < min_connections:
-            min_connections = edge_count
-            worst_times = [t]
-        elif edge_count == min_connections:
-            worst_times.append(t)
-    return worst_times
-
-def nodes_with_most_edge_changes(tgn):
-    edge_changes = {}
-    for snapshot in tgn:
-        for edge in snapshot["added_edges"]:
-            for node in edge[:2]:
-                edge_changes[node] = edge_changes.get(node, 0) + 1
-        for edge in snapshot["removed_edges"]:
-            for node in edge[:2]:
-                edge_changes[node] = edge_changes.get(node, 0) + 1
-    if not edge_changes:
-        return []
-    max_changes = max(edge_changes.values())
-    return [(node, count) for node, count in edge_changes.items() if count == max_changes]
+# Shared with the synthetic graphs; edge-change counts run on canonical edge keys
 
 def nodes_deleted_and_reappeared(tgn):
-    node_status = {}  # node → list of (appeared, disappeared) tuples
-    current_nodes = set()
-
-    for t, snapshot in enumerate(tgn):
-        now_nodes = snapshot["nodes"]
-
-        # newly appeared
-        for node in now_nodes - current_nodes:
-            if node not in node_status:
-                node_status[node] = []
-            node_status[node].append({"appeared": t})
-
-        # disappeared
-        for node in current_nodes - now_nodes:
-            if node in node_status and "appeared" in node_status[node][-1] and "disappeared" not in node_status[node][-1]:
-                node_status[node][-1]["disappeared"] = t
-
-        current_nodes = now_nodes
-
-    # Filter: nodes that disappeared and then reappeared later
-    reappeared_nodes = []
-    for node, events in node_status.items():
-        if len(events) > 1:
-            reappeared_nodes.append(node)
-
-    return sorted(reappeared_nodes)
+    # Presence of every node at every step as a (T, N) matrix over dense node
+    # ids; a node reappeared if it entered the graph more than once
+    steps = [np.fromiter((int(n) for n in snapshot["nodes"]), dtype=np.int64) for snapshot in tgn]
+    index = NodeIndex.from_ids(*steps)
+    presence = np.zeros((len(steps) + 1, len(index)), dtype=bool)
+    for t, nodes in enumerate(steps):
+        presence[t + 1, index.encode(nodes)] = True
+    entries = (presence[1:] & ~presence[:-1]).sum(axis=0)
+    return index.decode(np.flatnonzero(entries > 1)).tolist()
+
+STAFF = ["MED", "NUR", "ADM"]
+
+def patient_staff_contacts(tgn, roles):
+    # Number of patient-staff edges at every step, as role masks over each snapshot's edges
+    return [int(roles.edge_mask(snapshot["edges"], "PAT", STAFF).sum()) for snapshot in tgn]
 
 # === Main ===
 
@@ -94,16 +57,20 @@ def main():
         print(f"File not found: {INPUT_FILE}")
         return
 
-    with open(INPUT_FILE, "rb") as f:
-        tgn = pickle.load(f)
+    tgn = load_tgn(INPUT_FILE)
+    tgn_hash = tgn_digest(tgn)
 
     results = {
-        "node_first_appearance": safe_int(get_node_first_appearance(tgn, NODE_QUERY)),
-        "time_steps_most_connected": [safe_int(x) for x in time_steps_most_connected(tgn)],
-        "time_steps_least_connected": [safe_int(x) for x in time_steps_least_connected(tgn)],
-        "nodes_with_most_edge_changes": safe_pair_list(nodes_with_most_edge_changes(tgn)),
-        "nodes_deleted_and_reappeared": nodes_deleted_and_reappeared(tgn),
+        "node_first_appearance": safe_int(cached_call(get_node_first_appearance, tgn, NODE_QUERY, tgn_hash=tgn_hash)),
+        "time_steps_most_connected": [safe_int(x) for x in cached_call(time_steps_most_connected, tgn, tgn_hash=tgn_hash)],
+        "time_steps_least_connected": [safe_int(x) for x in cached_call(time_steps_least_connected, tgn, tgn_hash=tgn_hash)],
+        "nodes_with_most_edge_changes": safe_pair_list(cached_call(nodes_with_most_edge_changes, tgn, tgn_hash=tgn_hash)),
+        "nodes_deleted_and_reappeared": cached_call(nodes_deleted_and_reappeared, tgn, tgn_hash=tgn_hash),
     }
+    if os.path.exists(ROLES_FILE):
+        # The roles are keyed by the file's content, so a regenerated roles file is not served stale answers
+        results["patient_staff_contacts"] = cached_call(patient_staff_contacts, tgn, CategoricalAttribute.load(ROLES_FILE),
+                                                        tgn_hash=tgn_hash, args_key=file_digest(ROLES_FILE))
 
     os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
     with open(OUTPUT_FILE, "w") as f:
@@ -1,47 +1,480 @@
-# save as hospital_to_pkl.py
-import pandas as pd
-import numpy as np
+#!/usr/bin/env python3
+"""
+Converts the hospital contact log (contacts.dat) into hospital.pkl.
+
+Each line of the log is "time i j Si Sj": a contact between i and j at a
+20-second timestamp. Contacts are bucketed into 120-minute bins and every
+non-empty bin becomes one snapshot dict with its undirected edge set and the
+nodes / edges added and removed since the previous bin.
+
+The log is read in chunks (pd.read_csv(chunksize=...)) and each chunk is
+processed as arrays: edges become canonical int64 keys, one sort by
+(bin, key) plus np.unique gives every bin's distinct edges, and the diffs
+between consecutive bins are sorted-array set operations. Memory stays
+bounded by the chunk size and the edges of a single bin, so logs much
+larger than contacts.dat ingest the same way. The log must be sorted by time.
+
+--levels builds several resolutions in that same pass: the finest level is
+binned from the contacts, and each coarser level (a multiple of the one
+below) is aggregated from the distinct pairs of the finer one, so every
+resolution is ready for encoding-vs-granularity experiments at once. No raw
+contacts are carried between chunks: every level keeps only the distinct
+pairs (and weights) of its last, still open bin, merges a chunk's completed
+finer bins into it and hands its own completed bins to its SnapshotBuilder
+right away. Memory is bounded by the chunk size plus the distinct edges of
+one coarsest bin, whatever the length of the log.
+
+--window W --stride S produces overlapping windows [k*S, k*S + W) instead.
+Per-edge contact counters follow the stream: advancing the window only
+enters the contacts of its new end and drops those of its old start, and
+edges / nodes whose counter crosses zero become the snapshot's diffs.
+
+--weighted keeps how the pairs met instead of set membership only: every
+snapshot gets a "weights" array, row-aligned with "edges", holding each
+edge's contact count, first / last contact time and total duration in the
+bin. The aggregates are reduceat sums / minima / maxima over the same
+(bin, key) sort, so coarser levels merge the weights of finer ones.
+
+--dense_ids replaces the sparse raw node ids (e.g. 1157) by dense ids
+0..N-1 in every output, in raw-id order, and saves the raw ids as a
+NodeIndex (Utils/node_index.py) to map answers back; --roles then uses the
+dense ids too.
+
+--roles keeps the node roles (MED, ADM, NUR, PAT) the log carries as Si / Sj
+in a categorical node-attribute file (Utils/node_attributes.py), so
+role-filtered views are masks over the snapshots' edge arrays.
+
+Usage (from hospital/):
+    python hospital_to_plk.py --contacts contacts.dat --out hospital.pkl
+    python hospital_to_plk.py --levels 20,300,1800,7200,86400
+    python hospital_to_plk.py --window 7200 --stride 1800 --out hospital_sliding.pkl
+    python hospital_to_plk.py --weighted --out hospital_weighted.pkl
+    python hospital_to_plk.py --roles hospital_roles.npz
+    python hospital_to_plk.py --dense_ids hospital_ids.npy --out hospital_dense.pkl
+writes hospital.pkl, hospital_20s.pkl ... hospital_86400s.pkl, or the
+overlapping 2-hour windows every 30 minutes, or hospital.pkl's bins with
+weights; --roles also writes hospital_roles.npz and --dense_ids hospital_ids.npy.
+"""
+
+import argparse
+import os
 import pickle
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path so we can import from other modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Load and process the hospital contact data
-df = pd.read_csv("contacts.dat", sep="\t", header=None, names=["time", "i", "j", "Si", "Sj"])
+from Utils.edge_keys import SHIFT, MASK, edge_keys, keys_to_edges, diff_keys
+from Utils.node_attributes import CategoricalAttribute
+from Utils.node_index import NodeIndex, intern_snapshots
+
+COLUMNS = ["time", "i", "j", "Si", "Sj"]
 
 # Bucket by 120-minute intervals (4*1800 seconds)
-df["time_bin"] = df["time"] // (4*1800)
-
-snapshots = []
-last_edges = set()
-last_nodes = set()
-
-for t_bin, group in df.groupby("time_bin"):
-    # Build current edge set (undirected, sorted tuples)
-    edges = set(tuple(sorted([row["i"], row["j"]])) for _, row in group.iterrows())
-    
-    # Extract current node set
-    nodes = set([i for edge in edges for i in edge])
-
-    # Track changes
-    added_edges = edges - last_edges
-    removed_edges = last_edges - edges
-
-    new_nodes = nodes - last_nodes
-    removed_nodes = last_nodes - nodes
-
-    snapshot = {
-        "edges": np.array(list(edges)),
-        "nodes": nodes,
-        "new_nodes": new_nodes,
-        "removed_nodes": removed_nodes,
-        "added_edges": added_edges,
-        "removed_edges": removed_edges
-    }
-
-    snapshots.append(snapshot)
-    last_edges = edges
-    last_nodes = nodes
-
-# Save as hospital.pkl
-with open("hospital.pkl", "wb") as f:
-    pickle.dump(snapshots, f)
-
-print("Saved hospital.pkl with", len(snapshots), "snapshots")
+BIN_SECONDS = 4 * 1800
+
+
+# Resolutions built by --levels: 20 s (the log's own resolution), 5 min, 30 min, 2 h, 1 day
+LEVELS = (20, 300, 1800, BIN_SECONDS, 86400)
+
+
+# Every line of the log stands for 20 seconds of contact
+CONTACT_SECONDS = 20
+
+# Per-edge aggregates of a bin, stored row-aligned with "edges" under "weights"
+WEIGHT_DTYPE = np.dtype([
+    ("contacts", np.int64),        # contact records of the pair in the bin
+    ("first_contact", np.int64),   # time of the first and last of them
+    ("last_contact", np.int64),
+    ("duration", np.int64),        # seconds in contact (contacts * CONTACT_SECONDS)
+])
+
+
+def contact_weights(times):
+    """Weights of single contact records at the given times."""
+    weights = np.empty(len(times), dtype=WEIGHT_DTYPE)
+    weights["contacts"] = 1
+    weights["first_contact"] = weights["last_contact"] = times
+    weights["duration"] = CONTACT_SECONDS
+    return weights
+
+
+def _bin_starts(bins, keys, weights):
+    # Distinct (bin, key) pairs of rows sorted by (bin, key) with their weights
+    # merged, and where each bin starts
+    first = np.ones(len(keys), dtype=bool)
+    first[1:] = (bins[1:] != bins[:-1]) | (keys[1:] != keys[:-1])
+    groups = np.flatnonzero(first)
+    merged = np.empty(len(groups), dtype=WEIGHT_DTYPE)
+    if len(groups) > 0:
+        merged["contacts"] = np.add.reduceat(weights["contacts"], groups)
+        merged["first_contact"] = np.minimum.reduceat(weights["first_contact"], groups)
+        merged["last_contact"] = np.maximum.reduceat(weights["last_contact"], groups)
+        merged["duration"] = np.add.reduceat(weights["duration"], groups)
+    bins, keys = bins[groups], keys[groups]
+    unique_bins, starts = np.unique(bins, return_index=True)
+    return unique_bins, keys, np.append(starts, len(keys)), merged
+
+
+def bin_edge_keys(times, i, j, bin_seconds=BIN_SECONDS):
+    """
+    (bins, keys, starts, weights): distinct edge keys sorted by (bin, key),
+    where each bin starts, and every edge's WEIGHT_DTYPE aggregates in its bin.
+    """
+    return bin_levels(times, i, j, (bin_seconds,))[0]
+
+
+def bin_levels(times, i, j, levels=LEVELS):
+    """
+    bin_edge_keys for every resolution in levels (seconds, each a multiple of
+    the previous). Only the finest level touches the raw contacts; each
+    coarser level merges the distinct pairs and weights of the level below it.
+    """
+    check_levels(levels)
+    times = np.asarray(times, dtype=np.int64)
+    bins = times // levels[0]
+    keys = edge_keys(np.column_stack([i, j]))
+    order = np.lexsort((keys, bins))
+    binned = [_bin_starts(bins[order], keys[order], contact_weights(times[order]))]
+    for finer, coarser in zip(levels[:-1], levels[1:]):
+        fine_bins, fine_keys, fine_starts, fine_weights = binned[-1]
+        bins = np.repeat(fine_bins, np.diff(fine_starts)) // (coarser // finer)
+        order = np.lexsort((fine_keys, bins))
+        binned.append(_bin_starts(bins[order], fine_keys[order], fine_weights[order]))
+    return binned
+
+
+def check_levels(levels):
+    pairs = zip(levels[:-1], levels[1:])
+    if len(levels) == 0 or any(coarser <= finer or coarser % finer != 0 for finer, coarser in pairs):
+        raise ValueError(f"levels must be increasing, each a multiple of the previous: {levels}")
+
+
+def read_bins(path, bin_seconds=BIN_SECONDS, chunksize=1_000_000):
+    """Yield (bin, sorted edge keys, weights) for every non-empty bin of the contact log, in order."""
+    for (done,) in read_levels(path, (bin_seconds,), chunksize):
+        yield from done
+
+
+def read_levels(path, levels=LEVELS, chunksize=1_000_000):
+    """
+    One pass over the contact log. For every chunk, yields one list per level
+    of the (bin, sorted edge keys, weights) triples that chunk completed, in
+    order; the bins still open at the end of the log come last.
+    """
+    check_levels(levels)
+    # Distinct (bin, key, weights) rows of every level's last bin, which later chunks may extend
+    open_bins = [None] * len(levels)
+    for times, keys in read_contacts(path, chunksize):
+        yield _advance_levels(open_bins, levels, times // levels[0], keys, contact_weights(times))
+    empty = np.empty(0, dtype=np.int64)
+    yield _advance_levels(open_bins, levels, empty, empty, contact_weights(empty), final=True)
+
+
+def _advance_levels(open_bins, levels, bins, keys, weights, final=False):
+    # Merge finest-level rows into every level in turn; each coarser level
+    # only sees the bins its finer level completed
+    completed = []
+    for level, seconds in enumerate(levels):
+        if level > 0:
+            finer = completed[-1]
+            factor = seconds // levels[level - 1]
+            bins = np.repeat(np.array([b // factor for b, _, _ in finer], dtype=np.int64),
+                             [len(k) for _, k, _ in finer])
+            keys = np.concatenate([k for _, k, _ in finer]) if finer else np.empty(0, dtype=np.int64)
+            weights = np.concatenate([w for _, _, w in finer]) if finer else np.empty(0, dtype=WEIGHT_DTYPE)
+        done, open_bins[level] = _merge_open_bin(open_bins[level], bins, keys, weights, final)
+        completed.append(done)
+    return completed
+
+
+def _merge_open_bin(open_bin, bins, keys, weights, final):
+    # (completed triples, rows of the bin left open): the last bin stays open
+    # until a later bin shows up, or the log ends
+    if open_bin is not None:
+        bins = np.concatenate([open_bin[0], bins])
+        keys = np.concatenate([open_bin[1], keys])
+        weights = np.concatenate([open_bin[2], weights])
+    order = np.lexsort((keys, bins))
+    unique_bins, keys, starts, weights = _bin_starts(bins[order], keys[order], weights[order])
+    n_done = len(unique_bins) if final else max(len(unique_bins) - 1, 0)
+    done = [(int(b), keys[lo:hi], weights[lo:hi])
+            for b, lo, hi in zip(unique_bins[:n_done], starts[:n_done], starts[1:n_done + 1])]
+    if n_done == len(unique_bins):
+        return done, None
+    lo = starts[n_done]
+    return done, (np.full(len(keys) - lo, unique_bins[n_done]), keys[lo:], weights[lo:])
+
+
+def _edge_set(keys):
+    return set(map(tuple, keys_to_edges(keys).tolist()))
+
+
+class SnapshotBuilder:
+    """
+    Turns the bins of one level into snapshot dicts as they complete, diffing
+    each bin against the previous one. weighted adds the bin's per-edge
+    WEIGHT_DTYPE array as "weights", row-aligned with "edges".
+    """
+
+    def __init__(self, weighted=False):
+        self.weighted = weighted
+        self.last_keys = np.empty(0, dtype=np.int64)
+        self.last_nodes = np.empty(0, dtype=np.int64)
+
+    def add(self, keys, weights):
+        """Snapshot dict of the next bin (sorted edge keys and their weights)."""
+        edges = keys_to_edges(keys)
+        nodes = np.unique(edges)
+        added, removed = diff_keys(self.last_keys, keys)
+        snapshot = {
+            "edges": edges,
+            "nodes": set(nodes.tolist()),
+            "new_nodes": set(np.setdiff1d(nodes, self.last_nodes, assume_unique=True).tolist()),
+            "removed_nodes": set(np.setdiff1d(self.last_nodes, nodes, assume_unique=True).tolist()),
+            "added_edges": _edge_set(added),
+            "removed_edges": _edge_set(removed),
+        }
+        if self.weighted:
+            snapshot["weights"] = weights
+        self.last_keys, self.last_nodes = keys, nodes
+        return snapshot
+
+
+def build_snapshots(binned_keys, weighted=False):
+    """Snapshot dicts from (bin, sorted edge keys, weights) triples (see SnapshotBuilder)."""
+    builder = SnapshotBuilder(weighted)
+    return [builder.add(keys, weights) for _, keys, weights in binned_keys]
+
+
+def read_contacts(path, chunksize=1_000_000):
+    """Yield (times, edge keys) arrays per chunk of the contact log."""
+    last_time = None
+    for chunk in pd.read_csv(path, sep="\t", header=None, names=COLUMNS, usecols=["time", "i", "j"],
+                             chunksize=chunksize):
+        times = chunk["time"].to_numpy().astype(np.int64)
+        if np.any(times[1:] < times[:-1]) or (last_time is not None and times[0] < last_time):
+            raise ValueError(f"{path} is not sorted by time")
+        last_time = times[-1]
+        yield times, edge_keys(chunk[["i", "j"]].to_numpy())
+
+
+class SlidingWindow:
+    """
+    Contact counters of the window [start, start + window). Contacts enter
+    and leave in sorted batches; an edge is active while its counter is
+    positive and a node while any active edge touches it. Only the contacts
+    crossing the window bounds are touched, and the changes since the last
+    snapshot are tracked as they happen.
+    """
+
+    def __init__(self):
+        self.edge_counts = {}
+        self.node_counts = {}
+        # Changes since the last snapshot()
+        self.added_edges, self.removed_edges = set(), set()
+        self.new_nodes, self.removed_nodes = set(), set()
+
+    def enter(self, keys):
+        for key, count in zip(*np.unique(keys, return_counts=True)):
+            key = int(key)
+            if key not in self.edge_counts:
+                self.edge_counts[key] = 0
+                _flip(key, self.added_edges, self.removed_edges)
+                for node in _endpoints(key):
+                    self.node_counts[node] = self.node_counts.get(node, 0) + 1
+                    if self.node_counts[node] == 1:
+                        _flip(node, self.new_nodes, self.removed_nodes)
+            self.edge_counts[key] += int(count)
+
+    def leave(self, keys):
+        for key, count in zip(*np.unique(keys, return_counts=True)):
+            key = int(key)
+            self.edge_counts[key] -= int(count)
+            if self.edge_counts[key] == 0:
+                del self.edge_counts[key]
+                _flip(key, self.removed_edges, self.added_edges)
+                for node in _endpoints(key):
+                    self.node_counts[node] -= 1
+                    if self.node_counts[node] == 0:
+                        del self.node_counts[node]
+                        _flip(node, self.removed_nodes, self.new_nodes)
+
+    def __len__(self):
+        return len(self.edge_counts)
+
+    def snapshot(self):
+        """Snapshot dict of the current window, with the changes since the previous snapshot."""
+        keys = np.sort(np.fromiter(self.edge_counts, dtype=np.int64, count=len(self.edge_counts)))
+        snapshot = {
+            "edges": keys_to_edges(keys),
+            "nodes": set(self.node_counts),
+            "new_nodes": self.new_nodes,
+            "removed_nodes": self.removed_nodes,
+            "added_edges": _edge_set(np.array(sorted(self.added_edges), dtype=np.int64)),
+            "removed_edges": _edge_set(np.array(sorted(self.removed_edges), dtype=np.int64)),
+        }
+        self.added_edges, self.removed_edges = set(), set()
+        self.new_nodes, self.removed_nodes = set(), set()
+        return snapshot
+
+
+def _flip(item, changed, opposite):
+    # Record item as changed unless it undoes a change made since the last snapshot
+    if item in opposite:
+        opposite.discard(item)
+    else:
+        changed.add(item)
+
+
+def _endpoints(key):
+    return key >> int(SHIFT), key & int(MASK)
+
+
+def sliding_snapshots(path, window, stride, chunksize=1_000_000):
+    """
+    Yield (window start, snapshot dict) for the windows [k*stride, k*stride + window)
+    holding at least one contact, each diffed against the previous one yielded.
+    window == stride gives the tumbling bins of build_snapshots.
+    """
+    if window <= 0 or stride <= 0:
+        raise ValueError("window and stride must be positive")
+    contacts = read_contacts(path, chunksize)
+    times, keys = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    # Contacts in times[:entered] have entered the window, those in times[:left] have left it again
+    entered = left = 0
+    exhausted = False
+    state = SlidingWindow()
+    k = None
+    while True:
+        if k is None or (len(state) == 0 and entered < len(times)):
+            # Skip windows without contacts: jump to the first window holding the next contact
+            if entered == len(times) and not exhausted:
+                times, keys, entered, left, exhausted = _pull(contacts, times, keys, entered, left)
+                continue
+            if entered == len(times):
+                return
+            first = max(0, (int(times[entered]) - window) // stride + 1)
+            k = first if k is None else max(k, first)
+        start, end = k * stride, k * stride + window
+        # Make sure every contact before the window end has been read
+        while not exhausted and (len(times) == 0 or times[-1] < end):
+            times, keys, entered, left, exhausted = _pull(contacts, times, keys, entered, left)
+        stop = entered + int(np.searchsorted(times[entered:], end))
+        state.enter(keys[entered:stop])
+        entered = stop
+        stop = left + int(np.searchsorted(times[left:entered], start))
+        state.leave(keys[left:stop])
+        left = stop
+        if len(state) > 0:
+            yield start, state.snapshot()
+        elif exhausted and entered == len(times):
+            return
+        k += 1
+
+
+def _pull(contacts, times, keys, entered, left):
+    # Append the next chunk, dropping contacts that already left the window
+    chunk = next(contacts, None)
+    if chunk is None:
+        return times, keys, entered, left, True
+    times = np.concatenate([times[left:], chunk[0]])
+    keys = np.concatenate([keys[left:], chunk[1]])
+    return times, keys, entered - left, 0, False
+
+
+def read_roles(path, chunksize=1_000_000):
+    """Roles (Si / Sj) of every node in the contact log as a CategoricalAttribute."""
+    seen = []
+    for chunk in pd.read_csv(path, sep="\t", header=None, names=COLUMNS, usecols=["i", "j", "Si", "Sj"],
+                             chunksize=chunksize):
+        pairs = pd.concat([
+            chunk[["i", "Si"]].set_axis(["node", "role"], axis=1),
+            chunk[["j", "Sj"]].set_axis(["node", "role"], axis=1),
+        ])
+        seen.append(pairs.drop_duplicates())
+    pairs = pd.concat(seen).drop_duplicates()
+    return CategoricalAttribute.from_values(pairs["node"].to_numpy(), pairs["role"].to_numpy())
+
+
+def ingest_levels(path, levels=LEVELS, chunksize=1_000_000, weighted=False):
+    """
+    {bin seconds: snapshot dicts} for every level, from a single pass over the
+    log. Each level's bins become snapshots as soon as they complete.
+    """
+    builders = {seconds: SnapshotBuilder(weighted) for seconds in levels}
+    snapshots = {seconds: [] for seconds in levels}
+    for chunk_levels in read_levels(path, levels, chunksize):
+        for seconds, done in zip(levels, chunk_levels):
+            snapshots[seconds].extend(builders[seconds].add(keys, weights) for _, keys, weights in done)
+    return snapshots
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert the hospital contact log into a pickled TGN")
+    parser.add_argument("--contacts", default="contacts.dat", help="Tab-separated contact log (time i j Si Sj)")
+    parser.add_argument("--out", default="hospital.pkl", help="Output pickle")
+    # One snapshot mode: tumbling bins of one width (the default), several widths, or sliding windows
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--bin_seconds", type=int, default=None,
+                      help=f"Snapshot width in seconds (default: {BIN_SECONDS})")
+    mode.add_argument("--levels", default=None,
+                      help="Comma-separated bin widths in seconds (e.g. 20,300,1800,7200,86400); writes "
+                           "<out stem>_<seconds>s.pkl for each instead of --out")
+    mode.add_argument("--window", type=int, default=None,
+                      help="Sliding window width in seconds; writes overlapping windows to --out")
+    parser.add_argument("--stride", type=int, default=None,
+                        help="Sliding window step in seconds, with --window (default: --window)")
+    parser.add_argument("--weighted", action="store_true",
+                        help="Store per-edge contact counts, first/last contact and duration as \"weights\"")
+    parser.add_argument("--roles", default=None, help="Also write the node roles (Si / Sj) to this .npz")
+    parser.add_argument("--dense_ids", default=None,
+                        help="Write dense node ids 0..N-1 and save their raw ids (NodeIndex) to this .npy")
+    parser.add_argument("--chunksize", type=int, default=1_000_000, help="Log rows read per chunk")
+    args = parser.parse_args()
+    if args.stride is not None and args.window is None:
+        parser.error("--stride needs --window")
+
+    if args.window is not None:
+        if args.weighted:
+            parser.error("--weighted is only available for tumbling bins (--bin_seconds / --levels)")
+        windows = sliding_snapshots(args.contacts, args.window, args.stride or args.window, args.chunksize)
+        outputs = {args.out: [snapshot for _, snapshot in windows]}
+    elif args.levels is None:
+        outputs = {args.out: build_snapshots(read_bins(args.contacts, args.bin_seconds or BIN_SECONDS, args.chunksize),
+                                                    args.weighted)}
+    else:
+        levels = tuple(int(seconds) for seconds in args.levels.split(","))
+        stem = os.path.splitext(args.out)[0]
+        outputs = {
+            f"{stem}_{seconds}s.pkl": snapshots
+            for seconds, snapshots in ingest_levels(args.contacts, levels, args.chunksize, args.weighted).items()
+        }
+
+    index = None
+    if args.dense_ids is not None:
+        # One mapping shared by every output, so ids agree across levels
+        index = NodeIndex.from_ids(*(np.fromiter(snapshot["nodes"], dtype=np.int64, count=len(snapshot["nodes"]))
+                                     for snapshots in outputs.values() for snapshot in snapshots))
+        outputs = {path: intern_snapshots(snapshots, index)[0] for path, snapshots in outputs.items()}
+        index.save(args.dense_ids)
+        print(f"Saved {args.dense_ids} with the raw ids of", len(index), "nodes")
+
+    for path, snapshots in outputs.items():
+        with open(path, "wb") as f:
+            pickle.dump(snapshots, f)
+        print(f"Saved {path} with", len(snapshots), "snapshots")
+
+    if args.roles is not None:
+        roles = read_roles(args.contacts, args.chunksize)
+        if index is not None:
+            roles = CategoricalAttribute(NodeIndex(index.encode(roles.index.ids)), roles.codes, roles.categories)
+        roles.save(args.roles)
+        print(f"Saved {args.roles} with roles of", len(roles), "nodes")
+
+
+if __name__ == "__main__":
+    main()
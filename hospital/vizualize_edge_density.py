@@ -1,9 +1,15 @@
 #!/usr/bin/env python3
 
 import os
-import pickle
+import sys
 import matplotlib.pyplot as plt
 
+# Add parent directory to path so we can import from other modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Utils.temporal_graph import TemporalGraph
+from Utils.tgn_store import load_tgn
+
 # === Config ===
 INPUT_FILE = "hospital.pkl"
 OUTPUT_FILE = "Data/plots/edge_density_over_time.png"
@@ -11,10 +17,11 @@ OUTPUT_FILE = "Data/plots/edge_density_over_time.png"
 def load_temporal_graph(path):
     if not os.path.exists(path):
         raise FileNotFoundError(f"File not found: {path}")
-    with open(path, "rb") as f:
-        return pickle.load(f)
+    return load_tgn(path)
 
 def extract_edge_counts(tgn):
+    if isinstance(tgn, TemporalGraph):
+        return tgn.edge_counts().tolist()
     return [len(snapshot.get("edges", [])) for snapshot in tgn]
 
 def plot_edge_density(edge_counts, save_path):
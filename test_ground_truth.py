@@ -1,4 +1,3 @@
-import pickle
 import os
 import json
 from Utils.ground_truth import (
@@ -7,6 +6,8 @@ from Utils.ground_truth import (
     time_steps_least_connected,
     nodes_with_most_edge_changes
 )
+from Utils.artifact_cache import cached_call, tgn_digest
+from Utils.tgn_store import load_tgn
 
 def safe_int(val):
     return int(val) if hasattr(val, '__int__') else val
@@ -33,16 +34,16 @@ for file in graph_files:
         print(f"File {file} not found. Skipping.")
         continue
 
-    with open(file, "rb") as f:
-        tgn = pickle.load(f)
+    tgn = load_tgn(file)
+    tgn_hash = tgn_digest(tgn)
 
     node = node_queries[file]
 
     results[file] = {
-        "node_first_appearance": safe_int(get_node_first_appearance(tgn, node)),
-        "time_steps_most_connected": [safe_int(x) for x in time_steps_most_connected(tgn)],
-        "time_steps_least_connected": [safe_int(x) for x in time_steps_least_connected(tgn)],
-        "nodes_with_most_edge_changes": safe_pair_list(nodes_with_most_edge_changes(tgn)),
+        "node_first_appearance": safe_int(cached_call(get_node_first_appearance, tgn, node, tgn_hash=tgn_hash)),
+        "time_steps_most_connected": [safe_int(x) for x in cached_call(time_steps_most_connected, tgn, tgn_hash=tgn_hash)],
+        "time_steps_least_connected": [safe_int(x) for x in cached_call(time_steps_least_connected, tgn, tgn_hash=tgn_hash)],
+        "nodes_with_most_edge_changes": safe_pair_list(cached_call(nodes_with_most_edge_changes, tgn, tgn_hash=tgn_hash)),
     }
 
 # Save to JSON
@@ -0,0 +1,58 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Make the repository's packages (Utils, Graphs, ...) importable from the tests
+sys.path.append(REPO)
+
+
+@pytest.fixture
+def repo():
+    """Path of the repository root, for the bundled pickles and contacts.dat."""
+    return REPO
+
+
+def build_snapshots(*edge_lists):
+    # Snapshot dicts in the generators' layout: set() change fields at t=0, arrays after
+    tgn, last = [], None
+    for edges in edge_lists:
+        edges = np.array(edges, dtype=np.int64).reshape(-1, 2)
+        nodes = set(edges.ravel().tolist())
+        if last is None:
+            changes = {"new_nodes": set(), "removed_nodes": set(), "added_edges": set(), "removed_edges": set()}
+        else:
+            old = set(map(tuple, last.tolist()))
+            new = set(map(tuple, edges.tolist()))
+            old_nodes = set(last.ravel().tolist())
+            changes = {
+                "new_nodes": sorted(nodes - old_nodes),
+                "removed_nodes": sorted(old_nodes - nodes),
+                "added_edges": np.array(sorted(new - old), dtype=np.int64).reshape(-1, 2),
+                "removed_edges": np.array(sorted(old - new), dtype=np.int64).reshape(-1, 2),
+            }
+        tgn.append(dict(changes, edges=edges, nodes=nodes))
+        last = edges
+    return tgn
+
+
+@pytest.fixture
+def make_snapshots():
+    """Factory of generator-style snapshot dicts from one edge list per step."""
+    return build_snapshots
+
+
+@pytest.fixture
+def sparse_snapshots():
+    """Three steps in hospital.pkl's layout (sets of ints / tuples, (E, 2) edges) over sparse raw ids."""
+    return [
+        {"edges": np.array([[1157, 1232]]), "nodes": {1157, 1232},
+         "new_nodes": set(), "removed_nodes": set(), "added_edges": set(), "removed_edges": set()},
+        {"edges": np.array([[1157, 1232], [1232, 1295]]), "nodes": {1157, 1232, 1295},
+         "new_nodes": {1295}, "removed_nodes": set(), "added_edges": {(1232, 1295)}, "removed_edges": set()},
+        {"edges": np.array([[1232, 1295]]), "nodes": {1232, 1295},
+         "new_nodes": set(), "removed_nodes": {1157}, "added_edges": set(), "removed_edges": {(1157, 1232)}},
+    ]
@@ -0,0 +1,55 @@
+import inspect
+
+import numpy as np
+
+import Utils.edge_keys
+from Utils import artifact_cache
+from Utils.artifact_cache import ArtifactCache, cached_call, code_digest, project_dependencies
+from Utils.ground_truth import time_steps_most_connected
+
+
+def test_dependencies_follow_project_imports():
+    names = [module.__name__ for module in project_dependencies(inspect.getmodule(time_steps_most_connected))]
+    # ground_truth -> temporal_graph -> adjacency / node_index; numpy and the stdlib are left out
+    assert {"Utils.ground_truth", "Utils.edge_keys", "Utils.temporal_graph", "Utils.adjacency"} <= set(names)
+    assert all(name.startswith("Utils.") for name in names)
+
+
+def test_editing_a_helper_module_changes_the_digest(monkeypatch):
+    before = code_digest(time_steps_most_connected)
+    getsource = inspect.getsource
+
+    def edited(obj):
+        source = getsource(obj)
+        return source + "\n# edited\n" if obj is Utils.edge_keys else source
+
+    monkeypatch.setattr(artifact_cache.inspect, "getsource", edited)
+    assert code_digest(time_steps_most_connected) != before
+
+
+def test_clear_empties_the_cache(tmp_path):
+    cache = ArtifactCache(str(tmp_path))
+    tgn = [{"edges": np.array([[0, 1]]), "nodes": {0, 1}}]
+    cached_call(time_steps_most_connected, tgn, cache=cache)
+    assert cache.size()[0] == 1
+    cache.clear()
+    assert cache.size() == (0, 0)
+
+
+def test_args_key_replaces_object_arguments(tmp_path):
+    cache = ArtifactCache(str(tmp_path / "cache"))
+    tgn = [{"edges": np.array([[0, 1]]), "nodes": {0, 1}}]
+    calls = []
+
+    def count_edges(tgn, extra):
+        calls.append(extra)
+        return len(tgn[0]["edges"]) + extra.value
+
+    class Extra:
+        def __init__(self, value):
+            self.value = value
+
+    assert cached_call(count_edges, tgn, Extra(1), cache=cache, args_key="v1") == 2
+    assert cached_call(count_edges, tgn, Extra(1), cache=cache, args_key="v1") == 2
+    assert cached_call(count_edges, tgn, Extra(5), cache=cache, args_key="v2") == 6
+    assert len(calls) == 2
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from Utils.temporal_graph import TemporalGraph
+from Utils.tgn_store import save_tgn, open_tgn
+
+
+@pytest.fixture
+def long_graph(make_snapshots):
+    rng = np.random.default_rng(0)
+    steps = []
+    for _ in range(200):
+        pairs = rng.integers(0, 20, size=(15, 2))
+        pairs = np.unique(np.sort(pairs[pairs[:, 0] != pairs[:, 1]], axis=1), axis=0)
+        steps.append(pairs.tolist())
+    return make_snapshots(*steps)
+
+
+def test_reopened_store_has_stored_checkpoints(long_graph, tmp_path):
+    graph = TemporalGraph.from_snapshots(long_graph)
+    graph.checkpoint_every = 16
+    reopened = open_tgn(save_tgn(graph, str(tmp_path / "g.tgn")))
+    assert reopened.checkpoint_every == 16
+    assert len(reopened._checkpoints) == 13
+    for stored, replayed in zip(reopened._checkpoints, graph.checkpoints()):
+        assert np.array_equal(stored, replayed)
+
+
+def test_random_access_on_reopened_store_replays_at_most_k_steps(long_graph, tmp_path, monkeypatch):
+    graph = TemporalGraph.from_snapshots(long_graph)
+    graph.checkpoint_every = 16
+    path = save_tgn(graph, str(tmp_path / "g.tgn"))
+
+    applied = []
+    apply = TemporalGraph._apply
+    monkeypatch.setattr(TemporalGraph, "_apply", lambda self, edges, t: applied.append(t) or apply(self, edges, t))
+    rng = np.random.default_rng(1)
+    for t in rng.permutation(len(long_graph))[:40]:
+        expected = graph.edges_at(int(t))
+        reopened = open_tgn(path)
+        applied.clear()
+        assert np.array_equal(reopened[int(t)]["edges"], expected)
+        assert len(applied) == t % 16
+
+
+def test_other_checkpoint_spacing_ignores_stored_checkpoints(long_graph, tmp_path):
+    graph = TemporalGraph.from_snapshots(long_graph)
+    reopened = open_tgn(save_tgn(graph, str(tmp_path / "g.tgn")), checkpoint_every=10)
+    assert reopened._checkpoints == []
+    assert np.array_equal(reopened[123]["edges"], graph.edges_at(123))
@@ -0,0 +1,16 @@
+import numpy as np
+import pytest
+
+from Graphs.contact_models import iter_activity_driven
+
+
+def test_activity_driven_needs_two_nodes():
+    with pytest.raises(ValueError):
+        iter_activity_driven(1, 1.0, iterations=3)
+
+
+def test_activity_driven_edges_stay_within_nodes():
+    rng = np.random.default_rng(0)
+    for snapshot in iter_activity_driven(2, 1.0, m=3, iterations=5, rng=rng):
+        edges = snapshot["edges"]
+        assert edges.max() <= 1 and np.all(edges[:, 0] != edges[:, 1])
@@ -0,0 +1,28 @@
+import numpy as np
+
+from Encoding.encoding3 import encoding3
+from Utils.edge_intervals import EdgeIntervals
+from Utils.edge_keys import edge_keys
+from Utils.temporal_graph import TemporalGraph
+
+
+def readded_snapshots(make_snapshots):
+    # Edge (1, 2) is removed and added again at step 1 (as BA steps do when they reuse a node id)
+    tgn = make_snapshots([[0, 1], [1, 2]], [[0, 1], [1, 2]], [[0, 1], [1, 2]])
+    tgn[1]["removed_edges"] = np.array([[1, 2]])
+    tgn[1]["added_edges"] = np.array([[1, 2]])
+    return tgn
+
+
+def test_same_step_readd_splits_the_interval(make_snapshots):
+    intervals = EdgeIntervals.from_tgn(readded_snapshots(make_snapshots))
+    key = edge_keys(np.array([[1, 2]]))[0]
+    assert intervals.start[intervals.keys == key].tolist() == [0, 1]
+    assert intervals.end[intervals.keys == key].tolist() == [1, 3]
+    assert intervals.active_counts().tolist() == [2, 2, 2]
+    assert "2 (t=0, removed t=1)" in encoding3(readded_snapshots(make_snapshots))
+
+
+def test_temporal_graph_without_stored_diffs_keeps_one_interval(make_snapshots):
+    intervals = EdgeIntervals.from_tgn(TemporalGraph.from_snapshots(readded_snapshots(make_snapshots)))
+    assert intervals.start.tolist() == [0, 0] and intervals.end.tolist() == [3, 3]
@@ -0,0 +1,24 @@
+import os
+import pickle
+
+import pytest
+
+from Utils.ground_truth import (
+    get_node_first_appearance,
+    ground_truth_stream,
+    nodes_with_most_edge_changes,
+    time_steps_least_connected,
+    time_steps_most_connected,
+)
+
+
+@pytest.mark.parametrize("name", ["ba1.pkl", "er1.pkl", "complete1.pkl", "hospital/hospital.pkl"])
+def test_stream_matches_batch_answers(name, repo):
+    with open(os.path.join(repo, name), "rb") as f:
+        tgn = pickle.load(f)
+    node = next(iter(tgn[-1]["nodes"]))
+    answers = ground_truth_stream(iter(tgn), node)
+    assert answers["node_first_appearance"] == get_node_first_appearance(tgn, node)
+    assert answers["time_steps_most_connected"] == time_steps_most_connected(tgn)
+    assert answers["time_steps_least_connected"] == time_steps_least_connected(tgn)
+    assert answers["nodes_with_most_edge_changes"] == nodes_with_most_edge_changes(tgn)
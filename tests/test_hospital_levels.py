@@ -0,0 +1,26 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from hospital.hospital_to_plk import COLUMNS, LEVELS, bin_levels, build_snapshots, ingest_levels
+
+
+def test_chunked_levels_match_whole_log_binning(repo, tmp_path):
+    # The first 5000 contacts span most of a day, so at this chunk size every
+    # level has bins that straddle chunk boundaries
+    log = pd.read_csv(os.path.join(repo, "hospital", "contacts.dat"), sep="\t", header=None, names=COLUMNS,
+                      nrows=5000)
+    path = tmp_path / "contacts.dat"
+    log.to_csv(path, sep="\t", header=False, index=False)
+
+    levels = ingest_levels(str(path), LEVELS, chunksize=97, weighted=True)
+    binned = bin_levels(log["time"].to_numpy(), log["i"].to_numpy(), log["j"].to_numpy(), LEVELS)
+    for seconds, (bins, keys, starts, weights) in zip(LEVELS, binned):
+        triples = [(b, keys[lo:hi], weights[lo:hi]) for b, lo, hi in zip(bins, starts[:-1], starts[1:])]
+        expected = build_snapshots(triples, weighted=True)
+        assert len(levels[seconds]) == len(expected)
+        for got, want in zip(levels[seconds], expected):
+            assert np.array_equal(got["edges"], want["edges"])
+            assert np.array_equal(got["weights"], want["weights"])
+            assert got["new_nodes"] == want["new_nodes"] and got["removed_edges"] == want["removed_edges"]
@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+from Utils.node_attributes import MISSING, CategoricalAttribute, code_dtype
+
+
+def test_codes_widen_past_int8():
+    ids = np.arange(300)
+    values = [f"c{i:03d}" for i in range(300)]
+    attribute = CategoricalAttribute.from_values(ids, values)
+    assert attribute.codes.dtype == np.int16
+    assert attribute.values_of([0, 200, 299]).tolist() == ["c000", "c200", "c299"]
+    assert attribute.codes_of([299, 1000]).tolist() == [299, MISSING]
+
+
+def test_code_dtype():
+    assert code_dtype(4) == np.int8
+    assert code_dtype(128) == np.int8
+    assert code_dtype(129) == np.int16
+    with pytest.raises(ValueError):
+        code_dtype(1 << 40)
@@ -0,0 +1,28 @@
+import numpy as np
+
+from Utils.node_index import NodeIndex, intern_snapshots
+from Utils.temporal_graph import TemporalGraph
+
+
+def test_intern_snapshots_roundtrip(sparse_snapshots, tmp_path):
+    raw = sparse_snapshots
+    dense, index = intern_snapshots(raw)
+    assert index.ids.tolist() == [1157, 1232, 1295]
+    assert dense[1]["nodes"] == {0, 1, 2} and dense[1]["added_edges"] == {(1, 2)}
+    assert dense[2]["removed_nodes"] == {0}
+    for snapshot, interned in zip(raw, dense):
+        assert np.array_equal(index.decode(interned["edges"]), snapshot["edges"])
+
+    index.save(tmp_path / "ids.npy")
+    loaded = NodeIndex.load(tmp_path / "ids.npy")
+    assert np.array_equal(loaded.ids, index.ids)
+
+
+def test_intern_snapshots_matches_interned_graph(sparse_snapshots):
+    raw = sparse_snapshots
+    dense, index = intern_snapshots(raw)
+    graph, graph_index = TemporalGraph.from_snapshots(raw).interned()
+    assert np.array_equal(graph_index.ids, index.ids)
+    interned = TemporalGraph.from_snapshots(dense)
+    for t in range(len(raw)):
+        assert np.array_equal(np.sort(interned.edges_at(t), axis=0), np.sort(graph.edges_at(t), axis=0))
@@ -0,0 +1,29 @@
+import numpy as np
+
+from Utils.partitioned_store import PartitionedTGN, append_partition, write_partitioned
+
+
+def test_append_diffs_nodes_against_last_stored_step(make_snapshots, tmp_path):
+    path = str(tmp_path / "store.parts")
+    write_partitioned(make_snapshots([[0, 1], [1, 2]], [[0, 1]]), path, steps_per_partition=2)
+    # A batch built on its own: its first snapshot carries no node changes
+    append_partition(path, make_snapshots([[3, 4]], [[3, 4], [4, 5]]))
+
+    store = PartitionedTGN(path)
+    assert len(store) == 4
+    step = store[2]
+    assert step["nodes"] == {3, 4}
+    assert sorted(step["new_nodes"]) == [3, 4]
+    assert sorted(step["removed_nodes"]) == [0, 1]
+    assert sorted(store[3]["new_nodes"]) == [5] and list(store[3]["removed_nodes"]) == []
+    assert np.array_equal(store.edges_at(3), [[3, 4], [4, 5]])
+
+
+def test_append_keeps_nodes_shared_with_last_stored_step(make_snapshots, tmp_path):
+    path = str(tmp_path / "store.parts")
+    write_partitioned(make_snapshots([[0, 1], [1, 2]]), path, steps_per_partition=1)
+    append_partition(path, make_snapshots([[1, 2], [2, 3]]))
+
+    step = PartitionedTGN(path)[1]
+    assert sorted(step["new_nodes"]) == [3]
+    assert sorted(step["removed_nodes"]) == [0]
@@ -0,0 +1,59 @@
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from Utils.ground_truth import get_node_first_appearance
+from Utils.shared_tgn import SharedTGN
+from Utils.temporal_graph import TemporalGraph
+
+
+def first_appearance(shared, node):
+    return get_node_first_appearance(shared.graph, node)
+
+
+def edge_count_at(shared, t):
+    return len(shared.graph.edges_at(t))
+
+
+@pytest.fixture
+def hospital(repo):
+    with open(os.path.join(repo, "hospital", "hospital.pkl"), "rb") as f:
+        return TemporalGraph.from_snapshots(pickle.load(f))
+
+
+def test_workers_answer_from_shared_memory(hospital):
+    nodes = [1100, 1157, 1295]
+    steps = [0, 20, 45]
+    with SharedTGN.create(hospital) as shared:
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            answers = list(pool.map(first_appearance, [shared] * len(nodes), nodes))
+            counts = list(pool.map(edge_count_at, [shared] * len(steps), steps))
+    assert answers == [get_node_first_appearance(hospital, node) for node in nodes]
+    assert counts == [len(hospital.edges_at(t)) for t in steps]
+
+
+def test_graph_is_unavailable_after_close(hospital):
+    shared = SharedTGN.create(hospital)
+    assert np.array_equal(shared.graph.edges_at(40), hospital.edges_at(40))
+    shared.unlink()
+    with pytest.raises(ValueError):
+        shared.graph
+
+
+def test_close_refuses_while_graph_is_referenced(hospital):
+    shared = SharedTGN.create(hospital)
+    graph = shared.graph
+    events = graph.step_events(40)
+    with pytest.raises(BufferError):
+        shared.unlink()
+    # Still mapped, so the graph and its views stay readable
+    assert np.array_equal(graph.edges_at(40), hospital.edges_at(40))
+    assert len(events) == len(hospital.step_events(40))
+    with pytest.raises(ValueError):
+        shared.graph
+
+    del graph, events
+    shared.close()
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hospital.hospital_to_plk import COLUMNS, sliding_snapshots
+
+
+@pytest.fixture
+def contact_log(tmp_path):
+    # Bursts of contacts between 8 nodes separated by long silences, so windows
+    # without contacts have to be jumped over
+    rng = np.random.default_rng(0)
+    times = np.concatenate([start + 20 * np.sort(rng.integers(0, 30, 40)) for start in (0, 900, 9000, 9600, 30000)])
+    pairs = rng.integers(0, 8, size=(len(times), 2))
+    keep = pairs[:, 0] != pairs[:, 1]
+    log = pd.DataFrame({"time": times[keep], "i": pairs[keep, 0], "j": pairs[keep, 1], "Si": "NUR", "Sj": "PAT"},
+                       columns=COLUMNS)
+    path = tmp_path / "contacts.dat"
+    log.to_csv(path, sep="\t", header=False, index=False)
+    return str(path), log
+
+
+def brute_force(log, window, stride):
+    # Every window [k*stride, k*stride + window) holding a contact, diffed against the previous one kept
+    times = log["time"].to_numpy()
+    pairs = np.sort(log[["i", "j"]].to_numpy(), axis=1)
+    last_edges, last_nodes = set(), set()
+    for k in range(times.max() // stride + 1):
+        inside = (times >= k * stride) & (times < k * stride + window)
+        if not inside.any():
+            continue
+        edges = set(map(tuple, pairs[inside].tolist()))
+        nodes = {node for edge in edges for node in edge}
+        yield k * stride, {
+            "edges": sorted(edges),
+            "nodes": nodes,
+            "new_nodes": nodes - last_nodes,
+            "removed_nodes": last_nodes - nodes,
+            "added_edges": edges - last_edges,
+            "removed_edges": last_edges - edges,
+        }
+        last_edges, last_nodes = edges, nodes
+
+
+@pytest.mark.parametrize("window, stride", [(7200, 1800), (3600, 7200), (300, 20), (20, 20), (100, 30), (40, 7000)])
+@pytest.mark.parametrize("chunksize", [7, 64, 1000])
+def test_sliding_windows_match_brute_force(contact_log, window, stride, chunksize):
+    path, log = contact_log
+    got = list(sliding_snapshots(path, window, stride, chunksize))
+    expected = list(brute_force(log, window, stride))
+    assert [start for start, _ in got] == [start for start, _ in expected]
+    for (_, snapshot), (_, want) in zip(got, expected):
+        assert list(map(tuple, snapshot["edges"].tolist())) == want["edges"]
+        for field in ("nodes", "new_nodes", "removed_nodes", "added_edges", "removed_edges"):
+            assert snapshot[field] == want[field], field
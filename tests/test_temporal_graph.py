@@ -0,0 +1,29 @@
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from Utils.temporal_graph import TemporalGraph
+from Utils.tgn_store import save_tgn, open_tgn
+
+def test_edge_counts_with_trailing_empty_steps(make_snapshots, tmp_path):
+    graph = TemporalGraph.from_snapshots(make_snapshots([[0, 1]], [[0, 1]], [[0, 1]]))
+    assert graph.offsets[-1] == graph.offsets[1]
+    assert graph.edge_counts().tolist() == [1, 1, 1]
+
+    reopened = open_tgn(save_tgn(graph, str(tmp_path / "g.tgn")))
+    assert np.asarray(reopened.edge_counts()).tolist() == [1, 1, 1]
+
+
+def test_edge_counts_with_empty_middle_and_trailing_steps(make_snapshots):
+    graph = TemporalGraph.from_snapshots(make_snapshots([[0, 1]], [[0, 1], [1, 2]], [[0, 1], [1, 2]], [[1, 2]], [[1, 2]]))
+    assert graph.edge_counts().tolist() == [1, 2, 2, 1, 1]
+
+
+@pytest.mark.parametrize("name", ["ba1.pkl", "er1.pkl", "complete1.pkl", os.path.join("hospital", "hospital.pkl")])
+def test_edge_counts_match_snapshots(name, repo):
+    with open(os.path.join(repo, name), "rb") as f:
+        tgn = pickle.load(f)
+    graph = TemporalGraph.from_snapshots(tgn)
+    assert graph.edge_counts().tolist() == [len(snapshot["edges"]) for snapshot in tgn]
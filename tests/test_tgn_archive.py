@@ -0,0 +1,61 @@
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from Utils.temporal_graph import TemporalGraph, NODE_REMOVE
+from Utils.tgn_archive import TGNArchive, write_archive
+
+
+def assert_round_trip(tgn, path, block_steps):
+    graph = tgn if isinstance(tgn, TemporalGraph) else TemporalGraph.from_snapshots(tgn)
+    archive = TGNArchive(write_archive(graph, str(path), block_steps))
+    assert len(archive) == len(graph)
+    for t in range(len(graph)):
+        assert np.array_equal(archive.edges_at(t), graph.edges_at(t)), t
+    restored = archive.to_temporal_graph()
+    assert np.array_equal(restored.events, graph.events)
+    assert np.array_equal(restored.offsets, graph.offsets)
+    assert (restored.timestamped, restored.initial_added) == (graph.timestamped, graph.initial_added)
+    return archive
+
+
+@pytest.mark.parametrize("block_steps", [1, 5, 64])
+@pytest.mark.parametrize("name", ["ba1.pkl", "er1.pkl", os.path.join("hospital", "hospital.pkl")])
+def test_bundled_pickles_round_trip(name, block_steps, repo, tmp_path):
+    with open(os.path.join(repo, name), "rb") as f:
+        tgn = pickle.load(f)
+    assert_round_trip(tgn, tmp_path / "g.tgnz", block_steps)
+
+
+def test_timestamped_rows_round_trip(repo, tmp_path):
+    with open(os.path.join(repo, "er2.pkl"), "rb") as f:
+        tgn = pickle.load(f)
+    archive = assert_round_trip(tgn, tmp_path / "g.tgnz", 2)
+    assert archive.index["timestamped"] and archive.edges_at(len(tgn) - 1).shape[1] == 3
+
+
+def test_empty_steps_and_node_removals_round_trip(make_snapshots, tmp_path):
+    # Steps 2, 3 and 6 have no events; nodes 0 and 3 drop out
+    tgn = make_snapshots([[0, 1], [1, 2]], [[1, 2], [2, 3]], [[1, 2], [2, 3]], [[1, 2], [2, 3]],
+                         [[1, 2]], [[1, 2], [4, 5]], [[1, 2], [4, 5]])
+    graph = TemporalGraph.from_snapshots(tgn)
+    assert (graph.events["op"] == NODE_REMOVE).any()
+    assert np.diff(graph.offsets)[[2, 3, 6]].tolist() == [0, 0, 0]
+    # block_steps 3 puts a block boundary on the last step (block [6, 7))
+    archive = assert_round_trip(graph, tmp_path / "g.tgnz", 3)
+    assert archive.index["blocks"][-1]["start"] == len(tgn) - 1
+    for t in range(len(tgn)):
+        assert archive[t]["removed_nodes"] == graph[t]["removed_nodes"]
+
+
+def test_empty_graph_round_trip(make_snapshots, tmp_path):
+    assert_round_trip(make_snapshots([], [], [[0, 1]]), tmp_path / "g.tgnz", 2)
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not.tgnz"
+    path.write_bytes(b"x" * 32)
+    with pytest.raises(ValueError):
+        TGNArchive(str(path))
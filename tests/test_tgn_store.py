@@ -0,0 +1,40 @@
+import os
+import pickle
+
+import numpy as np
+
+from Utils.temporal_graph import TemporalGraph
+from Utils.tgn_store import save_tgn, load_tgn, store_path
+
+
+def write_pickle(path, tgn):
+    with open(path, "wb") as f:
+        pickle.dump(tgn, f)
+
+
+def test_load_tgn_prefers_store_converted_from_current_pickle(make_snapshots, tmp_path):
+    path = str(tmp_path / "g.pkl")
+    write_pickle(path, make_snapshots([[0, 1]], [[0, 1], [1, 2]]))
+    save_tgn(pickle.load(open(path, "rb")), store_path(path), source=path)
+    assert isinstance(load_tgn(path), TemporalGraph)
+
+
+def test_load_tgn_ignores_store_of_regenerated_pickle(make_snapshots, tmp_path):
+    path = str(tmp_path / "g.pkl")
+    write_pickle(path, make_snapshots([[0, 1]], [[0, 1], [1, 2]]))
+    save_tgn(pickle.load(open(path, "rb")), store_path(path), source=path)
+
+    write_pickle(path, make_snapshots([[3, 4]], [[3, 4], [4, 5]], [[5, 6]]))
+    stat = os.stat(path)
+    # A regenerated pickle gets a new mtime
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    tgn = load_tgn(path)
+    assert isinstance(tgn, list) and len(tgn) == 3
+    assert np.array_equal(tgn[0]["edges"], [[3, 4]])
+
+
+def test_load_tgn_ignores_store_without_source_stamp(make_snapshots, tmp_path):
+    path = str(tmp_path / "g.pkl")
+    write_pickle(path, make_snapshots([[0, 1]]))
+    save_tgn(pickle.load(open(path, "rb")), store_path(path))
+    assert isinstance(load_tgn(path), list)